@@ -0,0 +1,254 @@
+"""Offline stand-ins for Firecrawl and Groq used by the benchmark suite."""
+
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from firecrawl.v2.types import Document, DocumentMetadata, SearchData, SearchResultWeb
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from src.config.prompts import DeveloperToolsPrompts
+from src.config.schemas import BatchCompanyAnalysis, CompanyAnalysis
+from src.utils.firecrawl import FirecrawlService
+from src.utils.llm import MemoizedLLM
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class Fixtures:
+    """Recorded article and tool-page markdown plus canned analyses."""
+
+    def __init__(self, root: Path = FIXTURES_DIR):
+        self.articles = {
+            f"https://articles.example/{path.stem}": path.read_text()
+            for path in sorted((root / "articles").glob("*.md"))
+        }
+        self.tools = {
+            path.stem: path.read_text() for path in sorted((root / "tools").glob("*.md"))
+        }
+        self.analyses: Dict[str, Dict[str, Any]] = json.loads(
+            (root / "analyses.json").read_text()
+        )
+
+    def tool_url(self, slug: str) -> str:
+        return f"https://{slug}.example"
+
+    def page(self, url: str) -> Optional[str]:
+        if url in self.articles:
+            return self.articles[url]
+        for slug, markdown in self.tools.items():
+            if url.rstrip("/") == self.tool_url(slug):
+                return markdown
+        return None
+
+
+class ReplayFirecrawlApp:
+    """Replays fixtures through the `FirecrawlApp` search/scrape interface.
+
+    Searches ending in "official site" resolve to the matching tool page;
+    any other search returns the recorded articles. Every call sleeps for
+    `latency` seconds to model the network round trip.
+    """
+
+    def __init__(self, fixtures: Fixtures, latency: float = 0.0):
+        self.fixtures = fixtures
+        self.latency = latency
+
+    def _search(self, query: str, limit: Optional[int]) -> SearchData:
+        limit = limit or 5
+        match = re.match(r"(.+?) official site", query, re.IGNORECASE)
+        if match:
+            slug = re.sub(r"[^a-z0-9]", "", match.group(1).lower())
+            if slug not in self.fixtures.tools:
+                return SearchData(web=[])
+            url = self.fixtures.tool_url(slug)
+            results = [self._result(url, self.fixtures.tools[slug])]
+        else:
+            results = [
+                self._result(url, markdown)
+                for url, markdown in self.fixtures.articles.items()
+            ]
+        return SearchData(web=results[:limit])
+
+    def _scrape(self, url: str) -> Document:
+        markdown = self.fixtures.page(url)
+        if markdown is None:
+            raise ValueError(f"No fixture recorded for {url}")
+        return self._document(url, markdown)
+
+    def _result(self, url: str, markdown: str) -> SearchResultWeb:
+        title = markdown.lstrip("# ").splitlines()[0] if markdown else url
+        return SearchResultWeb(url=url, title=title, description=markdown[:200])
+
+    def _document(self, url: str, markdown: str) -> Document:
+        return Document(markdown=markdown, metadata=DocumentMetadata(url=url))
+
+    def search(self, query: str, limit: Optional[int] = None, **kwargs) -> SearchData:
+        time.sleep(self.latency)
+        return self._search(query, limit)
+
+    def scrape(self, url: str, **kwargs) -> Document:
+        time.sleep(self.latency)
+        return self._scrape(url)
+
+
+class AsyncReplayFirecrawlApp(ReplayFirecrawlApp):
+    async def search(self, query: str, limit: Optional[int] = None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._search(query, limit)
+
+    async def scrape(self, url: str, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._scrape(url)
+
+
+def stub_firecrawl_service(fixtures: Fixtures, latency: float = 0.0) -> FirecrawlService:
+    """A real `FirecrawlService` (cache, metrics and all) over replayed fixtures."""
+    return FirecrawlService(
+        app=ReplayFirecrawlApp(fixtures, latency),
+        async_app=AsyncReplayFirecrawlApp(fixtures, latency),
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning canned answers after a configurable delay.
+
+    Replies are chosen by the system prompt: tool extraction returns the
+    fixture tool names, recommendations a fixed paragraph, and structured
+    calls the canned `CompanyAnalysis` for each tool named in the prompt.
+    """
+
+    fixtures: Any
+    latency: float = 0.0
+    tokens_per_second: float = 0.0  # Completion speed; 0 means instant
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        system = str(messages[0].content) if messages else ""
+        if system == DeveloperToolsPrompts.TOOL_EXTRACTION_SYSTEM:
+            return "\n".join(self.fixtures.analyses)
+        return (
+            "Supabase is the best fit: it bundles Postgres with auth, storage and "
+            "instant APIs. Its free tier covers prototypes and Pro is $25/month. "
+            "The main technical advantage is the auto-generated REST and GraphQL API."
+        )
+
+    def _delay(self, completion: str) -> float:
+        delay = self.latency
+        if self.tokens_per_second:
+            delay += (len(completion) / 4) / self.tokens_per_second
+        return delay
+
+    def _message(self, messages: List[BaseMessage], content: str) -> AIMessage:
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4,
+            },
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        content = self._reply(messages)
+        time.sleep(self._delay(content))
+        return ChatResult(
+            generations=[ChatGeneration(message=self._message(messages, content))]
+        )
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        content = self._reply(messages)
+        await asyncio.sleep(self._delay(content))
+        return ChatResult(
+            generations=[ChatGeneration(message=self._message(messages, content))]
+        )
+
+    def _stream_parts(self, content: str) -> List[str]:
+        # Stream line by line, so line-oriented consumers see partial output
+        return content.splitlines(keepends=True) or [content]
+
+    def _stream_chunk(self, part: str) -> ChatGenerationChunk:
+        return ChatGenerationChunk(message=AIMessageChunk(content=part))
+
+    def _stream(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for part in self._stream_parts(self._reply(messages)):
+            time.sleep(self._delay(part) - self.latency)
+            yield self._stream_chunk(part)
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for part in self._stream_parts(self._reply(messages)):
+            await asyncio.sleep(self._delay(part) - self.latency)
+            yield self._stream_chunk(part)
+
+    def _analysis(self, name: str) -> CompanyAnalysis:
+        canned = self.fixtures.analyses.get(name.strip())
+        if canned is None:
+            return CompanyAnalysis(pricing_model="Unknown", description=name)
+        return CompanyAnalysis(**canned)
+
+    def _structured(self, messages: List[BaseMessage], schema):
+        prompt = str(messages[-1].content)
+        if schema is BatchCompanyAnalysis:
+            names = re.findall(r"### Company/Tool: (.+)", prompt)
+            return BatchCompanyAnalysis(
+                analyses=[
+                    {**self._analysis(name).model_dump(), "tool_name": name}
+                    for name in names
+                ]
+            )
+        match = re.search(r"Company/Tool: (.+)", prompt)
+        return self._analysis(match.group(1) if match else "")
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs):
+        def wrap(messages: List[BaseMessage], parsed):
+            if not include_raw:
+                return parsed
+            raw = self._message(messages, parsed.model_dump_json())
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        def invoke(messages):
+            parsed = self._structured(messages, schema)
+            time.sleep(self._delay(parsed.model_dump_json()))
+            return wrap(messages, parsed)
+
+        async def ainvoke(messages):
+            parsed = self._structured(messages, schema)
+            await asyncio.sleep(self._delay(parsed.model_dump_json()))
+            return wrap(messages, parsed)
+
+        return RunnableLambda(invoke, afunc=ainvoke)
+
+
+def fake_llm(
+    fixtures: Fixtures,
+    latency: float = 0.0,
+    cache=None,
+    tokens_per_second: float = 0.0,
+) -> MemoizedLLM:
+    """A `MemoizedLLM` over `FakeChatModel`, uncached unless `cache` is given."""
+    return MemoizedLLM(
+        FakeChatModel(
+            fixtures=fixtures, latency=latency, tokens_per_second=tokens_per_second
+        ),
+        model="fake-chat",
+        temperature=0.0,
+        cache=cache,
+    )
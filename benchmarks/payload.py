@@ -0,0 +1,162 @@
+"""Recommendation payload benchmark: prompt size of each company encoding.
+
+Encodes the fixture tools the way the recommendation prompt used to
+(pretty-printed JSON per company) and with the compact encoding, and
+reports characters and estimated tokens for both. Fails if the compact
+encoding is not smaller, or if the capped one overruns the budget:
+
+    python -m benchmarks.payload
+    python -m benchmarks.payload --budget 300 --output results/payload.json
+
+Token counts use the same chars-per-token estimate as the token budgets,
+which undercounts JSON punctuation, so real savings are somewhat larger.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+
+def _environment():
+    os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+    os.environ.setdefault("FIRECRAWL_API_KEY", "offline-benchmark")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def _companies() -> List[Any]:
+    from src.config.schemas import CompanyInfo
+
+    from .fakes import Fixtures
+
+    fixtures = Fixtures()
+    companies = [
+        CompanyInfo(
+            name=name,
+            website=fixtures.tool_url(name.lower()),
+            **{"pricing_model": "Unknown", **analysis},
+        )
+        for name, analysis in fixtures.analyses.items()
+    ]
+    # A tool whose analysis failed, as the workflow records it
+    companies.append(CompanyInfo(name="Nhost", description="Nhost", website=""))
+    # A sprawling platform whose analysis runs past the per-company budget
+    companies.append(
+        CompanyInfo(
+            name="Appwrite",
+            description=(
+                "Open source backend server for web, mobile and Flutter developers "
+                "that bundles authentication, databases, storage, serverless "
+                "functions, messaging and realtime subscriptions behind one API, "
+                "and can be self-hosted with Docker or used as a managed cloud."
+            ),
+            website="https://appwrite.io",
+            pricing_model="Freemium",
+            is_open_source=True,
+            tech_stack=[
+                "Docker", "MariaDB", "Redis", "PHP", "Swoole", "Traefik",
+                "ClamAV", "InfluxDB", "Telegraf",
+            ],
+            language_support=[
+                "JavaScript", "TypeScript", "Flutter", "Dart", "Swift", "Kotlin",
+                "Android", "Python", "Ruby", "PHP", "Go", "Deno", ".NET",
+            ],
+            api_available=True,
+            integration_capabilities=[
+                "GitHub", "Vercel", "Netlify", "Stripe", "Twilio", "Mailgun",
+                "SendGrid", "OAuth2 providers", "Cloudflare",
+            ],
+            competitors=["Firebase", "Supabase", "Nhost", "PocketBase", "Parse"],
+        )
+    )
+    return companies
+
+
+def _json_payload(companies) -> str:
+    return "\n\n".join(
+        f"Tool: {company.name}\n" + company.model_dump_json(indent=2)
+        for company in companies
+    )
+
+
+def _measure(text: str) -> Dict[str, int]:
+    from src.utils.tokens import estimate_tokens
+
+    return {"chars": len(text), "estimated_tokens": estimate_tokens(text)}
+
+
+def _check(companies, results: Dict[str, Any], budget: int):
+    """Raise if the compact encoding or the budget cap stopped paying off."""
+    from src.utils.payload import compact_company
+
+    json_tokens = results["json"]["estimated_tokens"]
+    if results["compact"]["estimated_tokens"] >= json_tokens:
+        raise AssertionError(
+            f"Compact encoding ({results['compact']['estimated_tokens']} tokens) "
+            f"is not smaller than JSON ({json_tokens} tokens)"
+        )
+    if budget <= 0:
+        return
+
+    for company in companies:
+        size = len(compact_company(company, budget))
+        if size > budget:
+            raise AssertionError(
+                f"{company.name} takes {size} chars, over the {budget} budget"
+            )
+    if any(len(compact_company(company)) > budget for company in companies) and (
+        results["compact_capped"]["chars"] >= results["compact"]["chars"]
+    ):
+        raise AssertionError(f"The {budget}-char budget did not shorten the payload")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="CodeScout recommendation payload benchmark")
+    parser.add_argument(
+        "--budget",
+        type=int,
+        help="Per-company character cap (defaults to RECOMMENDATION_COMPANY_BUDGET)",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    _environment()
+    from src.config.settings import get_settings
+    from src.utils.payload import compact_companies
+
+    budget = (
+        args.budget
+        if args.budget is not None
+        else get_settings().RECOMMENDATION_COMPANY_BUDGET
+    )
+    companies = _companies()
+    results: Dict[str, Any] = {
+        "companies": len(companies),
+        "budget": budget,
+        "json": _measure(_json_payload(companies)),
+        "compact": _measure(compact_companies(companies)),
+        "compact_capped": _measure(compact_companies(companies, budget)),
+    }
+    baseline = results["json"]["estimated_tokens"]
+    for name in ("compact", "compact_capped"):
+        saved = baseline - results[name]["estimated_tokens"]
+        results[name]["saved_tokens"] = saved
+        results[name]["saved_percent"] = round(100 * saved / baseline, 1)
+
+    print(f"{len(companies)} companies, per-company budget {budget} chars")
+    for name in ("json", "compact", "compact_capped"):
+        print(f"{name:<16} {json.dumps(results[name])}")
+    _check(companies, results, budget)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
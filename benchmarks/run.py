@@ -0,0 +1,240 @@
+"""Offline benchmark suite for the research workflow.
+
+Runs the real graph, services and caches against replayed Firecrawl
+fixtures and a fake chat model, so results are reproducible and need no
+API keys or network access:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenario throughput --concurrency 8 --latency 0.2
+    python -m benchmarks.run --output results/baseline.json
+
+`--latency` is the simulated round trip of every Firecrawl and LLM call,
+and `--tokens-per-second` adds LLM generation time on top of it.
+The on-disk cache and tool knowledge base are disabled unless `--cache` is
+passed, in which case fresh temporary stores are warmed by the first
+iteration.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+QUERIES = [
+    "postgres hosting",
+    "firebase alternatives",
+    "serverless database",
+    "backend as a service",
+]
+
+SCENARIOS = ("latency", "throughput", "memory")
+
+
+def _configure_environment(args: argparse.Namespace):
+    # Settings are read on first import of `src`, so this must run before it
+    os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+    os.environ.setdefault("FIRECRAWL_API_KEY", "offline-benchmark")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Fixture URLs are not real sites, so never HEAD them
+    os.environ["PAGE_REVALIDATION"] = "false"
+    # Measure the pipeline itself, not the client-side provider quotas
+    for provider in ("GROQ", "FIRECRAWL"):
+        os.environ.setdefault(f"{provider}_REQUESTS_PER_MINUTE", "1000000")
+        os.environ.setdefault(f"{provider}_BURST", "1000")
+    enabled = "true" if args.cache else "false"
+    directory = tempfile.mkdtemp(prefix="codescout-bench-")
+    os.environ["CACHE_ENABLED"] = enabled
+    os.environ["CACHE_PATH"] = os.path.join(directory, "cache.sqlite3")
+    os.environ["KNOWLEDGE_BASE_ENABLED"] = enabled
+    os.environ["KNOWLEDGE_BASE_PATH"] = os.path.join(directory, "knowledge.sqlite3")
+    # Checkpointing is part of every real run, so it stays on
+    os.environ["CHECKPOINT_PATH"] = os.path.join(directory, "checkpoints.sqlite3")
+
+
+def _build_workflow(args: argparse.Namespace):
+    from src.utils.workflow import Workflow
+
+    from .fakes import Fixtures, fake_llm, stub_firecrawl_service
+
+    fixtures = Fixtures()
+    return Workflow(
+        firecrawl=stub_firecrawl_service(fixtures, latency=args.latency),
+        llm=fake_llm(
+            fixtures, latency=args.latency, tokens_per_second=args.tokens_per_second
+        ),
+    )
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def percentile(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return ordered[index]
+
+    return {
+        "runs": len(ordered),
+        "mean_s": round(statistics.fmean(ordered), 4),
+        "p50_s": round(percentile(0.50), 4),
+        "p95_s": round(percentile(0.95), 4),
+        "max_s": round(ordered[-1], 4),
+    }
+
+
+def bench_latency(workflow, args: argparse.Namespace) -> Dict[str, Any]:
+    """Wall-clock time of sequential single-query runs."""
+    samples = []
+    companies = 0
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        result = workflow.run(QUERIES[i % len(QUERIES)])
+        samples.append(time.perf_counter() - start)
+        companies += len(result.companies)
+    return {**_summarize(samples), "companies_per_run": companies / len(samples)}
+
+
+def bench_throughput(workflow, args: argparse.Namespace) -> Dict[str, Any]:
+    """Queries per second with `--concurrency` runs in flight, sync and async."""
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.iterations)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(workflow.run, queries))
+    threaded = time.perf_counter() - start
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def run_one(query: str):
+            async with semaphore:
+                return await workflow.arun(query)
+
+        await asyncio.gather(*(run_one(query) for query in queries))
+
+    start = time.perf_counter()
+    asyncio.run(run_all())
+    asynchronous = time.perf_counter() - start
+
+    return {
+        "runs": len(queries),
+        "concurrency": args.concurrency,
+        "threaded_qps": round(len(queries) / threaded, 3),
+        "async_qps": round(len(queries) / asynchronous, 3),
+    }
+
+
+def bench_memory(workflow, args: argparse.Namespace) -> Dict[str, Any]:
+    """Peak traced allocations of one run, after a warm-up run."""
+    workflow.run(QUERIES[0])
+
+    peaks = []
+    for i in range(args.iterations):
+        tracemalloc.start()
+        workflow.run(QUERIES[i % len(QUERIES)])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+
+    return {
+        "runs": len(peaks),
+        "peak_kib_mean": round(statistics.fmean(peaks) / 1024, 1),
+        "peak_kib_max": round(max(peaks) / 1024, 1),
+    }
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "latency": bench_latency,
+    "throughput": bench_throughput,
+    "memory": bench_memory,
+}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="CodeScout offline benchmarks")
+    parser.add_argument(
+        "--scenario", choices=SCENARIOS + ("all",), default="all"
+    )
+    parser.add_argument("--iterations", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Simulated seconds per Firecrawl/LLM call",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Simulated LLM generation speed; 0 completes instantly",
+    )
+    parser.add_argument(
+        "--cache", action="store_true", help="Enable the on-disk response cache and knowledge base"
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    _configure_environment(args)
+
+    from src.config.settings import get_settings
+    from src.utils.metrics import Metrics
+
+    workflow = _build_workflow(args)
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+
+    results: Dict[str, Any] = {}
+    for name in scenarios:
+        Metrics().reset()
+        results[name] = BENCHMARKS[name](workflow, args)
+        print(f"{name:<12} {json.dumps(results[name])}")
+
+    settings = get_settings()
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "options": vars(args),
+        "settings": {
+            "RESEARCH_MAX_TOOLS": settings.RESEARCH_MAX_TOOLS,
+            "RESEARCH_MAX_CONCURRENCY": settings.RESEARCH_MAX_CONCURRENCY,
+            "SCRAPE_MAX_WORKERS": settings.SCRAPE_MAX_WORKERS,
+            "ANALYSIS_BATCH_SIZE": settings.ANALYSIS_BATCH_SIZE,
+            "CACHE_ENABLED": settings.CACHE_ENABLED,
+            "KNOWLEDGE_BASE_ENABLED": settings.KNOWLEDGE_BASE_ENABLED,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return report
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,108 @@
+"""Cold-start benchmark: import and construction time in fresh interpreters.
+
+Each sample runs in a new Python process, so nothing is already imported
+or cached:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --iterations 20 --output results/startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Each probe prints the seconds spent in its measured section
+PROBES: Dict[str, str] = {
+    "import_workflow": (
+        "import time; start = time.perf_counter(); "
+        "import src.utils.workflow; "
+        "print(time.perf_counter() - start)"
+    ),
+    "construct_workflow": (
+        "import time; from src.utils.workflow import Workflow; "
+        "start = time.perf_counter(); Workflow(); "
+        "print(time.perf_counter() - start)"
+    ),
+    "import_and_construct": (
+        "import time; start = time.perf_counter(); "
+        "from src.utils.workflow import Workflow; Workflow(); "
+        "print(time.perf_counter() - start)"
+    ),
+    "build_graph": (
+        "import time; from src.utils.workflow import Workflow; "
+        "workflow = Workflow(); start = time.perf_counter(); workflow.workflow; "
+        "print(time.perf_counter() - start)"
+    ),
+}
+
+# Modules whose presence after `Workflow()` means a deferred import leaked
+HEAVY_MODULES = ("langgraph", "langchain_core", "langchain_groq", "firecrawl")
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "offline-benchmark")
+    env.setdefault("FIRECRAWL_API_KEY", "offline-benchmark")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    return env
+
+
+def _sample(code: str, env: Dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _loaded_heavy_modules(env: Dict[str, str]) -> List[str]:
+    code = (
+        "import sys; from src.utils.workflow import Workflow; Workflow(); "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    ).stdout
+    loaded = output.strip().splitlines()[-1] if output.strip() else ""
+    return [name for name in loaded.split(",") if name]
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="CodeScout startup benchmark")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    env = _environment()
+    results = {}
+    for name, code in PROBES.items():
+        samples = [_sample(code, env) for _ in range(args.iterations)]
+        results[name] = {
+            "runs": len(samples),
+            "median_ms": round(statistics.median(samples) * 1000, 1),
+            "min_ms": round(min(samples) * 1000, 1),
+            "max_ms": round(max(samples) * 1000, 1),
+        }
+        print(f"{name:<22} {json.dumps(results[name])}")
+
+    results["heavy_modules_after_construct"] = _loaded_heavy_modules(env)
+    print(f"heavy modules loaded by Workflow(): {results['heavy_modules_after_construct']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
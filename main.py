@@ -1,7 +1,38 @@
+import argparse
+import asyncio
+import sys
+
 from src.utils.workflow import Workflow
 
 
-def main():
+def print_company(i, company):
+    print(f"\n{i}. 🏢 {company.name}")
+    print(f"   🌐 Website: {company.website}")
+    print(f"   💰 Pricing: {company.pricing_model}")
+    print(f"   📖 Open Source: {company.is_open_source}")
+
+    if company.tech_stack:
+        print(f"   🛠️  Tech Stack: {', '.join(company.tech_stack[:5])}")
+
+    if company.language_support:
+        print(f"   💻 Language Support: {', '.join(company.language_support[:5])}")
+
+    if company.api_available is not None:
+        api_status = "✅ Available" if company.api_available else "❌ Not Available"
+        print(f"   🔌 API: {api_status}")
+
+    if company.integration_capabilities:
+        print(
+            f"   🔗 Integrations: {', '.join(company.integration_capabilities[:4])}"
+        )
+
+    if company.description and company.description != "Analysis failed":
+        print(f"   📝 Description: {company.description}")
+
+    print()
+
+
+def interactive():
     workflow = Workflow()
     print("Developer Tools Research Agent")
 
@@ -11,44 +42,108 @@ def main():
             break
 
         if query:
-            result = workflow.run(query)
             print(f"\n📊 Results for: {query}")
             print("=" * 60)
 
-            for i, company in enumerate(result.companies, 1):
-                print(f"\n{i}. 🏢 {company.name}")
-                print(f"   🌐 Website: {company.website}")
-                print(f"   💰 Pricing: {company.pricing_model}")
-                print(f"   📖 Open Source: {company.is_open_source}")
+            researched = 0
+            recommending = False
+            for event in workflow.stream(query):
+                if event.type == "tools" and event.tools:
+                    print(f"🔬 Researching: {', '.join(event.tools)}")
+                elif event.type == "company":
+                    researched += 1
+                    print_company(researched, event.company)
+                elif event.type == "token":
+                    if not recommending:
+                        print("Developer Recommendations: ")
+                        print("-" * 40)
+                        recommending = True
+                    print(event.token, end="", flush=True)
+
+            if recommending:
+                print()
 
-                if company.tech_stack:
-                    print(f"   🛠️  Tech Stack: {', '.join(company.tech_stack[:5])}")
 
-                if company.language_support:
-                    print(
-                        f"   💻 Language Support: {', '.join(company.language_support[:5])}"
-                    )
+def prewarm(tool_names, refresh=False):
+    workflow = Workflow()
+    print(f"📚 Pre-warming knowledge base with {len(tool_names)} tools")
 
-                if company.api_available is not None:
-                    api_status = (
-                        "✅ Available" if company.api_available else "❌ Not Available"
-                    )
-                    print(f"   🔌 API: {api_status}")
+    outcomes = asyncio.run(workflow.aprewarm(tool_names, refresh=refresh))
+    for name, outcome in outcomes.items():
+        icon = {"fresh": "✔️", "researched": "✅", "failed": "❌"}[outcome]
+        print(f"{icon} {name}: {outcome}")
 
-                if company.integration_capabilities:
-                    print(
-                        f"   🔗 Integrations: {', '.join(company.integration_capabilities[:4])}"
-                    )
 
-                if company.description and company.description != "Analysis failed":
-                    print(f"   📝 Description: {company.description}")
+def batch(input_file, output_file, concurrency=None):
+    from src.utils.batch import BatchRunner
 
-                print()
+    counts = BatchRunner(concurrency=concurrency).run(input_file, output_file)
+    print(
+        f"📦 {counts['ok']} queries succeeded, {counts['error']} failed",
+        file=sys.stderr,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Developer Tools Research Agent")
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP research API")
+    serve_parser.add_argument("--host", help="Bind address (defaults to HOST)")
+    serve_parser.add_argument("--port", type=int, help="Port (defaults to PORT)")
+
+    prewarm_parser = subparsers.add_parser(
+        "prewarm", help="Research tools into the knowledge base ahead of queries"
+    )
+    prewarm_parser.add_argument("tools", nargs="*", help="Tool names to research")
+    prewarm_parser.add_argument(
+        "--file",
+        type=argparse.FileType("r"),
+        help="File with one tool name per line ('-' for stdin)",
+    )
+    prewarm_parser.add_argument(
+        "--refresh", action="store_true", help="Re-research tools that are still fresh"
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Research queries from a file, writing JSONL results"
+    )
+    batch_parser.add_argument(
+        "input",
+        nargs="?",
+        type=argparse.FileType("r"),
+        default=sys.stdin,
+        help="JSONL ({\"query\": ...}) or one query per line; defaults to stdin",
+    )
+    batch_parser.add_argument(
+        "--output",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="Where to write JSONL results (defaults to stdout)",
+    )
+    batch_parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Queries researched at once (defaults to BATCH_CONCURRENCY)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        from src.utils.server import serve
 
-            if result.analysis:
-                print("Developer Recommendations: ")
-                print("-" * 40)
-                print(result.analysis)
+        serve(args.host, args.port)
+    elif args.command == "prewarm":
+        tool_names = list(args.tools)
+        if args.file:
+            tool_names += [line.strip() for line in args.file if line.strip()]
+        if not tool_names:
+            prewarm_parser.error("no tool names given")
+        prewarm(tool_names, refresh=args.refresh)
+    elif args.command == "batch":
+        batch(args.input, args.output, args.concurrency)
+    else:
+        interactive()
 
 
 if __name__ == "__main__":
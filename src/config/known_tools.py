@@ -0,0 +1,304 @@
+"""Dictionary of well-known developer tools, used to spot them in articles.
+
+Keys are canonical tool names as they should be researched; values are
+extra spellings found in the wild. The canonical name itself always
+matches, so only list aliases that differ from it, and avoid aliases that
+are ordinary words ("Next", "Spring") since they would match prose.
+`HINT_ONLY_TOOLS` lists engines and infrastructure that articles mention
+in passing; they are passed to the LLM as hints but never picked directly.
+"""
+
+from typing import Dict, FrozenSet, Tuple
+
+KNOWN_TOOLS: Dict[str, Tuple[str, ...]] = {
+    # Backend-as-a-service and databases
+    "Supabase": (),
+    "Firebase": ("Google Firebase",),
+    "Appwrite": (),
+    "Nhost": (),
+    "PocketBase": ("Pocket Base",),
+    "Convex": (),
+    "Parse Platform": ("Parse Server",),
+    "AWS Amplify": (),
+    "Hasura": (),
+    "Xata": (),
+    "PlanetScale": ("Planet Scale",),
+    "Neon": ("Neon Postgres", "Neon.tech"),
+    "CockroachDB": ("Cockroach DB", "CockroachLabs"),
+    "Turso": (),
+    "Fauna": ("FaunaDB",),
+    "MongoDB Atlas": (),
+    "MongoDB": ("Mongo",),
+    "PostgreSQL": ("Postgres",),
+    "MySQL": (),
+    "SQLite": (),
+    "Redis": (),
+    "Upstash": (),
+    "DynamoDB": ("Amazon DynamoDB", "AWS DynamoDB"),
+    "Amazon RDS": ("AWS RDS",),
+    "Aurora": ("Amazon Aurora", "Aurora Serverless"),
+    "Cloud SQL": ("Google Cloud SQL",),
+    "Azure Cosmos DB": ("Cosmos DB", "CosmosDB"),
+    "Aiven": (),
+    "Timescale": ("TimescaleDB",),
+    "ClickHouse": (),
+    "Cassandra": ("Apache Cassandra",),
+    "ScyllaDB": (),
+    "SingleStore": ("MemSQL",),
+    "TiDB": ("TiDB Cloud",),
+    "YugabyteDB": ("Yugabyte",),
+    "SurrealDB": (),
+    "EdgeDB": (),
+    "Cloudflare D1": (),
+    # Vector databases and search
+    "Pinecone": (),
+    "Weaviate": (),
+    "Qdrant": (),
+    "Milvus": (),
+    "Chroma": ("ChromaDB",),
+    "pgvector": (),
+    "Elasticsearch": ("Elastic Search",),
+    "OpenSearch": (),
+    "Algolia": (),
+    "Meilisearch": (),
+    "Typesense": (),
+    # Hosting and deployment
+    "Vercel": (),
+    "Netlify": (),
+    "Render": ("Render.com",),
+    "Railway": ("Railway.app",),
+    "Fly.io": ("Fly io",),
+    "Heroku": (),
+    "DigitalOcean": ("Digital Ocean", "DigitalOcean App Platform"),
+    "Cloudflare Pages": (),
+    "Cloudflare Workers": (),
+    "Deno Deploy": (),
+    "Koyeb": (),
+    "Northflank": (),
+    "Coolify": (),
+    "Dokku": (),
+    "Linode": ("Akamai Linode",),
+    "Vultr": (),
+    "Hetzner": ("Hetzner Cloud",),
+    "AWS": ("Amazon Web Services",),
+    "Google Cloud": ("GCP", "Google Cloud Platform"),
+    "Microsoft Azure": ("Azure",),
+    "Oracle Cloud": ("OCI", "Oracle Cloud Infrastructure"),
+    "IBM Cloud": (),
+    "AWS Lambda": ("Amazon Lambda",),
+    "Google Cloud Run": ("Cloud Run",),
+    "Azure Functions": (),
+    "Kubernetes": ("K8s",),
+    "Docker": (),
+    "Podman": (),
+    "Nomad": ("HashiCorp Nomad",),
+    # Infrastructure as code and configuration
+    "Terraform": ("HashiCorp Terraform",),
+    "OpenTofu": (),
+    "Pulumi": (),
+    "Ansible": (),
+    "AWS CDK": ("CDK",),
+    "Crossplane": (),
+    # CI/CD and source control
+    "GitHub": (),
+    "GitLab": (),
+    "Bitbucket": (),
+    "GitHub Actions": (),
+    "GitLab CI": ("GitLab CI/CD",),
+    "CircleCI": ("Circle CI",),
+    "Jenkins": (),
+    "Travis CI": (),
+    "Buildkite": (),
+    "Argo CD": ("ArgoCD",),
+    "Drone CI": (),
+    # Observability
+    "Datadog": (),
+    "New Relic": ("NewRelic",),
+    "Grafana": (),
+    "Prometheus": (),
+    "Sentry": (),
+    "Honeycomb": (),
+    "Dynatrace": (),
+    "Splunk": (),
+    "Elastic Observability": (),
+    "Better Stack": ("BetterStack", "Logtail"),
+    "Axiom": (),
+    "SigNoz": (),
+    "OpenTelemetry": ("OTel",),
+    "PostHog": (),
+    "LogRocket": (),
+    # Authentication
+    "Auth0": (),
+    "Clerk": (),
+    "Okta": (),
+    "Firebase Authentication": ("Firebase Auth",),
+    "AWS Cognito": ("Cognito", "Amazon Cognito"),
+    "Keycloak": (),
+    "SuperTokens": (),
+    "Stytch": (),
+    "WorkOS": (),
+    "Kinde": (),
+    "Ory": (),
+    "Lucia": (),
+    "NextAuth.js": ("NextAuth", "Auth.js"),
+    # Messaging, queues and background jobs
+    "Kafka": ("Apache Kafka",),
+    "RabbitMQ": (),
+    "NATS": (),
+    "Amazon SQS": ("SQS", "AWS SQS"),
+    "Google Pub/Sub": ("Pub/Sub",),
+    "Temporal": (),
+    "Inngest": (),
+    "Trigger.dev": (),
+    "Celery": (),
+    "Sidekiq": (),
+    "BullMQ": (),
+    # APIs, payments and communication
+    "Stripe": (),
+    "Paddle": (),
+    "Lemon Squeezy": ("LemonSqueezy",),
+    "Twilio": (),
+    "SendGrid": (),
+    "Resend": (),
+    "Postmark": (),
+    "Mailgun": (),
+    "Pusher": (),
+    "Ably": (),
+    "Postman": (),
+    "Insomnia": (),
+    "Kong": ("Kong Gateway",),
+    "Apollo GraphQL": ("Apollo Server", "Apollo Client"),
+    "tRPC": (),
+    # Storage and CDN
+    "Amazon S3": ("S3", "AWS S3"),
+    "Cloudflare R2": (),
+    "Backblaze B2": ("Backblaze",),
+    "Cloudinary": (),
+    "UploadThing": (),
+    "MinIO": (),
+    "Cloudflare": (),
+    "Fastly": (),
+    "Bunny.net": ("BunnyCDN",),
+    # Frontend and backend frameworks
+    "React": ("React.js", "ReactJS"),
+    "Next.js": ("NextJS",),
+    "Vue.js": ("Vue", "VueJS"),
+    "Nuxt": ("Nuxt.js",),
+    "Angular": (),
+    "Svelte": (),
+    "SvelteKit": (),
+    "Remix": (),
+    "Astro": (),
+    "SolidJS": ("Solid.js",),
+    "Qwik": (),
+    "Gatsby": (),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": (),
+    "Express": ("Express.js", "ExpressJS"),
+    "NestJS": ("Nest.js",),
+    "Ruby on Rails": ("Rails",),
+    "Laravel": (),
+    "Spring Boot": (),
+    "ASP.NET Core": ("ASP.NET",),
+    "Phoenix": (),
+    "Hono": (),
+    # ORMs and data tooling
+    "Prisma": (),
+    "Drizzle ORM": ("Drizzle",),
+    "TypeORM": (),
+    "Sequelize": (),
+    "SQLAlchemy": (),
+    "Hibernate": (),
+    "dbt": (),
+    "Airbyte": (),
+    "Fivetran": (),
+    "Snowflake": (),
+    "BigQuery": ("Google BigQuery",),
+    "Databricks": (),
+    "Amazon Redshift": ("Redshift",),
+    "DuckDB": (),
+    "MotherDuck": (),
+    # Testing and quality
+    "Jest": (),
+    "Vitest": (),
+    "Playwright": (),
+    "Cypress": (),
+    "Selenium": (),
+    "Puppeteer": (),
+    "pytest": (),
+    "SonarQube": ("SonarCloud",),
+    "Snyk": (),
+    "Dependabot": (),
+    # Editors, AI and developer productivity
+    "Visual Studio Code": ("VS Code", "VSCode"),
+    "JetBrains": ("IntelliJ IDEA", "IntelliJ"),
+    "Cursor": (),
+    "GitHub Copilot": ("Copilot",),
+    "Codeium": (),
+    "Tabnine": (),
+    "Sourcegraph": (),
+    "Replit": (),
+    "CodeSandbox": (),
+    "StackBlitz": (),
+    "Gitpod": (),
+    "GitHub Codespaces": ("Codespaces",),
+    "LangChain": (),
+    "LlamaIndex": (),
+    "OpenAI": (),
+    "Anthropic": (),
+    "Hugging Face": ("HuggingFace",),
+    "Ollama": (),
+    "Groq": (),
+    "Together AI": (),
+    "Replicate": (),
+    "Modal": (),
+    # Feature flags, CMS and product tooling
+    "LaunchDarkly": (),
+    "Unleash": (),
+    "Flagsmith": (),
+    "GrowthBook": (),
+    "Contentful": (),
+    "Sanity": (),
+    "Strapi": (),
+    "Payload CMS": (),
+    "Directus": (),
+    "Ghost": (),
+    "Retool": (),
+    "Appsmith": (),
+    "Budibase": (),
+    "ToolJet": (),
+    "n8n": (),
+    "Zapier": (),
+}
+
+# Database engines, platforms and infrastructure that most articles mention
+# as building blocks ("built on Postgres", "deploys from a GitHub repo")
+# rather than as the tools they compare
+HINT_ONLY_TOOLS: FrozenSet[str] = frozenset(
+    {
+        "PostgreSQL",
+        "MySQL",
+        "SQLite",
+        "Redis",
+        "MongoDB",
+        "Cassandra",
+        "Elasticsearch",
+        "OpenSearch",
+        "Kafka",
+        "RabbitMQ",
+        "NATS",
+        "pgvector",
+        "Docker",
+        "Podman",
+        "Kubernetes",
+        "GitHub",
+        "GitLab",
+        "Bitbucket",
+        "AWS",
+        "Google Cloud",
+        "Microsoft Azure",
+        "Cloudflare",
+        "OpenTelemetry",
+    }
+)
@@ -1,12 +1,72 @@
 """Logging configuration for the application."""
 
+import atexit
+import copy
+import json
 import os
 import logging
-import coloredlogs
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
 
 from .settings import get_settings
 from .singleton import Singleton
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(run_id)s] %(message)s"
+# Shown in place of a run ID for records logged outside a workflow run
+NO_RUN_ID = "-"
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class RunIdFilter(logging.Filter):
+    """Tags each record with the ID of the workflow run that logged it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Imported here because the run context module depends on config
+        from ..utils.context import current_run
+
+        run = current_run()
+        record.run_id = run.run_id if run else NO_RUN_ID
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", NO_RUN_ID),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queues records with their message resolved but otherwise unformatted.
+
+    The stock handler bakes the traceback into the message; keeping it in
+    `exc_text` lets the JSON formatter report it as its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Arguments may be mutated or unpicklable once the caller moves on
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 
 class Logger(metaclass=Singleton):
     """Logger class to manage application logging as a Singleton."""
@@ -15,33 +75,60 @@ class Logger(metaclass=Singleton):
         """Initialize logging configuration once."""
         if not hasattr(self, "_initialized"):
             self.settings = get_settings()
+            self.listener = None
             self._setup_logging()
             self._initialized = True
 
-    def _setup_logging(self):
-        """Setup logging configuration."""
+    def _formatter(self, colored: bool = False) -> logging.Formatter:
+        if self.settings.LOG_FORMAT == "json":
+            return JsonFormatter()
+        if colored:
+            import coloredlogs
 
-        log_file = self.settings.LOG_FILE
-        log_level = self.settings.LOG_LEVEL
+            return coloredlogs.ColoredFormatter(TEXT_FORMAT)
+        return logging.Formatter(TEXT_FORMAT)
 
-        if log_file:
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    def _handlers(self):
+        """Console handler, plus a file handler when LOG_FILE is set."""
+        from humanfriendly.terminal import terminal_supports_colors
 
-        logging.basicConfig(
-            level=log_level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        )
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(self._formatter(colored=terminal_supports_colors(sys.stderr)))
+        handlers = [console]
 
+        log_file = self.settings.LOG_FILE
         if log_file:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
             file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(log_level)
-            file_format = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            file_handler.setFormatter(file_format)
-            logging.getLogger().addHandler(file_handler)
-
-        coloredlogs.install(level=log_level, logger=logging.getLogger())
+            file_handler.setFormatter(self._formatter())
+            handlers.append(file_handler)
+        return handlers
+
+    def _setup_logging(self):
+        """Setup logging configuration.
+
+        With LOG_ASYNC, callers only tag records and put them on a queue; a
+        background thread formats them and does the console and file I/O.
+        """
+        root = logging.getLogger()
+        root.setLevel(self.settings.LOG_LEVEL)
+
+        handlers = self._handlers()
+        if not self.settings.LOG_ASYNC:
+            for handler in handlers:
+                handler.addFilter(RunIdFilter())
+                root.addHandler(handler)
+            return
+
+        # Filters run on the calling thread, where its run is still current
+        queue_handler = RecordQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(RunIdFilter())
+        root.addHandler(queue_handler)
+
+        self.listener = logging.handlers.QueueListener(queue_handler.queue, *handlers)
+        self.listener.start()
+        # Drain records still queued when the interpreter exits
+        atexit.register(self.listener.stop)
 
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger instance with colored logs for console."""
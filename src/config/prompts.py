@@ -1,3 +1,6 @@
+from typing import Dict, List, Optional
+
+
 class DeveloperToolsPrompts:
     """Collection of prompts for analyzing developer tools and technologies"""
 
@@ -6,9 +9,18 @@ class DeveloperToolsPrompts:
                             Focus on actual products/tools that developers can use, not general concepts or features."""
 
     @staticmethod
-    def tool_extraction_user(query: str, content: str) -> str:
+    def tool_extraction_user(
+        query: str, content: str, hints: Optional[List[str]] = None
+    ) -> str:
+        hint_section = ""
+        if hints:
+            hint_section = f"""
+                Known tools detected in these articles (most prominent first): {", ".join(hints)}
+                Use them as candidates, but only keep the ones relevant to the query.
+"""
         return f"""Query: {query}
                 Article Content: {content}
+{hint_section}
 
                 Extract a list of specific tool/service names mentioned in this content that are relevant to "{query}".
 
@@ -34,7 +46,7 @@ class DeveloperToolsPrompts:
     @staticmethod
     def tool_analysis_user(company_name: str, content: str) -> str:
         return f"""Company/Tool: {company_name}
-                Website Content: {content[:2500]}
+                Website Content: {content}
 
                 Analyze this content from a developer's perspective and provide:
                 - pricing_model: One of "Free", "Freemium", "Paid", "Enterprise", or "Unknown"
@@ -47,6 +59,27 @@ class DeveloperToolsPrompts:
 
                 Focus on developer-relevant features like APIs, SDKs, language support, integrations, and development workflows."""
 
+    @staticmethod
+    def tool_batch_analysis_user(pages: Dict[str, str]) -> str:
+        tool_sections = "\n\n".join(
+            f"""### Company/Tool: {name}
+                Website Content: {content}"""
+            for name, content in pages.items()
+        )
+        return f"""{tool_sections}
+
+                Analyze each tool above from a developer's perspective. Return one entry per tool with:
+                - tool_name: The exact Company/Tool name given above
+                - pricing_model: One of "Free", "Freemium", "Paid", "Enterprise", or "Unknown"
+                - is_open_source: true if open source, false if proprietary, null if unclear
+                - tech_stack: List of programming languages, frameworks, databases, APIs, or technologies supported/used
+                - description: Brief 1-sentence description focusing on what this tool does for developers
+                - api_available: true if REST API, GraphQL, SDK, or programmatic access is mentioned
+                - language_support: List of programming languages explicitly supported (e.g., Python, JavaScript, Go, etc.)
+                - integration_capabilities: List of tools/platforms it integrates with (e.g., GitHub, VS Code, Docker, AWS, etc.)
+
+                Only use each tool's own content for its entry."""
+
     # Recommendation prompts
     RECOMMENDATIONS_SYSTEM = """You are a senior software engineer providing quick, concise tech recommendations.
                             Keep responses brief and actionable - maximum 3-4 sentences total."""
@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict, Any
+import operator
+from typing import Annotated, List, Literal, Optional, Dict
 from pydantic import BaseModel
 
 
@@ -14,6 +15,18 @@ class CompanyAnalysis(BaseModel):
     integration_capabilities: List[str] = []
 
 
+class ToolAnalysis(CompanyAnalysis):
+    """Company analysis tagged with the tool it describes, for batched calls"""
+
+    tool_name: str
+
+
+class BatchCompanyAnalysis(BaseModel):
+    """Structured output for analyzing several tools in one LLM call"""
+
+    analyses: List[ToolAnalysis] = []
+
+
 class CompanyInfo(BaseModel):
     name: str
     description: str
@@ -29,9 +42,65 @@ class CompanyInfo(BaseModel):
     developer_experience_rating: Optional[str] = None  # Poor, Good, Excellent
 
 
+class PendingAnalysis(BaseModel):
+    """A researched tool whose page content still awaits batched analysis"""
+
+    company: CompanyInfo
+    content: str
+
+
+def merge_pending(
+    left: List[PendingAnalysis], right: Optional[List[PendingAnalysis]]
+) -> List[PendingAnalysis]:
+    """Append pending analyses; writing None clears the list once consumed."""
+    if right is None:
+        return []
+    return left + right
+
+
+class StageTokenUsage(BaseModel):
+    """Token usage accumulated by one workflow stage"""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    calls: int = 0
+    cache_hits: int = 0
+    estimated_calls: int = 0  # Calls whose usage was estimated locally
+
+
+class OperationTiming(BaseModel):
+    """Latency of one kind of operation within a workflow run"""
+
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
 class ResearchState(BaseModel):
     query: str
     extracted_tools: List[str] = []  # Tools extracted from articles
-    companies: List[CompanyInfo] = []
-    search_results: List[Dict[str, Any]] = []
+    research_targets: List[str] = []  # Tools dispatched to the research fan-out
+    # Each research branch appends its own result, merged in dispatch order
+    companies: Annotated[List[CompanyInfo], operator.add] = []
+    pending_analyses: Annotated[List[PendingAnalysis], merge_pending] = []
     analysis: Optional[str] = None
+    token_usage: Dict[str, StageTokenUsage] = {}  # Filled in once a run completes
+    timings: Dict[str, OperationTiming] = {}  # Filled in once a run completes
+
+
+class ToolResearchState(BaseModel):
+    """Input for a single branch of the research fan-out"""
+
+    query: str
+    tool_name: str
+
+
+class WorkflowEvent(BaseModel):
+    """Incremental output emitted while a workflow run is streaming"""
+
+    type: Literal["tools", "company", "token", "done"]
+    tools: Optional[List[str]] = None  # type == "tools"
+    company: Optional[CompanyInfo] = None  # type == "company"
+    token: Optional[str] = None  # type == "token"
+    result: Optional[ResearchState] = None  # type == "done"
@@ -3,7 +3,7 @@
 import os
 from dotenv import load_dotenv
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 load_dotenv()
@@ -15,15 +15,103 @@ class Settings(BaseSettings):
     # Server settings
     HOST: str = "localhost"
     PORT: int = 8000
-    LOG_LEVEL: str = "DEBUG"
+    LOG_LEVEL: str = "INFO"
     LOG_FILE: Optional[str] = None
+    # "text", or "json" for one JSON object per line
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Hand records to a background thread so logging never blocks callers
+    LOG_ASYNC: bool = True
 
     # LLM settings
     GROQ_API_KEY: str = os.environ.get("GROQ_API_KEY")
     DEFAULT_MODEL: str = "llama-3.1-8b-instant"
     DEFAULT_TEMPERATURE: float = 0.0
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES: int = 2000
+
+    # Token budgets, checked before each prompt is sent (None = unlimited)
+    TOKEN_BUDGET_PER_QUERY: Optional[int] = None
+    TOKEN_BUDGET_EXTRACT_TOOLS: Optional[int] = None
+    TOKEN_BUDGET_RESEARCH: Optional[int] = None
+    TOKEN_BUDGET_ANALYZE: Optional[int] = None
 
     FIRECRAWL_API_KEY: str = os.environ.get("FIRECRAWL_API_KEY")
+    SCRAPE_MAX_WORKERS: int = 4
+    # Hedged scrapes: once a scrape runs past the observed p95 latency (after
+    # SCRAPE_HEDGE_MIN_SAMPLES scrapes), fall back to the search markdown or
+    # race a backup request. No scrape is waited on longer than SCRAPE_TIMEOUT
+    SCRAPE_HEDGING: bool = True
+    SCRAPE_TIMEOUT: float = 30.0
+    SCRAPE_HEDGE_MIN_SAMPLES: int = 20
+    SCRAPE_HEDGE_MIN_DELAY: float = 1.0
+    # Seconds a query may take before research stops and whatever has been
+    # gathered is returned; 0 disables the deadline
+    QUERY_DEADLINE: float = 120.0
+
+    # Client-side rate limits per provider; in-flight requests adapt between
+    # 1 and *_MAX_CONCURRENCY depending on 429 responses
+    GROQ_REQUESTS_PER_MINUTE: float = 30
+    GROQ_BURST: int = 10
+    GROQ_MAX_CONCURRENCY: int = 8
+    FIRECRAWL_REQUESTS_PER_MINUTE: float = 100
+    FIRECRAWL_BURST: int = 10
+    FIRECRAWL_MAX_CONCURRENCY: int = 8
+
+    # Retries for rate-limited and transient errors (delays in seconds)
+    MAX_RETRIES: int = 3
+    RETRY_BASE_DELAY: float = 1.0
+    RETRY_MAX_DELAY: float = 30.0
+
+    # Cache settings (TTLs in seconds)
+    CACHE_ENABLED: bool = True
+    CACHE_PATH: str = ".cache/codescout.sqlite3"
+    CACHE_MAX_ENTRIES: int = 5000
+    CACHE_SEARCH_TTL: int = 6 * 60 * 60
+    CACHE_SCRAPE_TTL: int = 24 * 60 * 60
+    # Once a scrape expires, ask the site with a conditional HEAD before
+    # re-scraping, for pages that declare a modification time
+    PAGE_REVALIDATION: bool = True
+    PAGE_CHECK_TIMEOUT: float = 3.0
+
+    # Knowledge base of researched tools, reused until older than the max age
+    KNOWLEDGE_BASE_ENABLED: bool = True
+    KNOWLEDGE_BASE_PATH: str = ".cache/knowledge.sqlite3"
+    KNOWLEDGE_MAX_AGE: int = 7 * 24 * 60 * 60
+
+    # LangGraph checkpoints, so a failed run can resume from its last
+    # completed step; a run's checkpoints are dropped once it succeeds, and
+    # failed runs untouched for CHECKPOINT_MAX_AGE seconds are pruned
+    # (0 keeps them forever)
+    CHECKPOINT_ENABLED: bool = True
+    CHECKPOINT_PATH: str = ".cache/checkpoints.sqlite3"
+    CHECKPOINT_MAX_AGE: int = 7 * 24 * 60 * 60
+
+    # Known-tool matching: skip the extraction LLM call when at least
+    # TOOL_MATCH_MIN_CONFIDENT dictionary tools are featured in the articles
+    TOOL_MATCHER_ENABLED: bool = True
+    TOOL_MATCH_MIN_CONFIDENT: int = 3
+    TOOL_MATCH_MAX_HINTS: int = 10
+    # Minimum difflib similarity for two tool names to count as the same tool
+    TOOL_NAME_FUZZY_CUTOFF: float = 0.9
+
+    # Stream the extraction response and start researching each tool as soon
+    # as its line arrives, overlapping research with the rest of the list
+    PIPELINED_EXTRACTION: bool = False
+
+    # Queries researched at once by the batch runner
+    BATCH_CONCURRENCY: int = 4
+
+    # Research settings
+    RESEARCH_MAX_TOOLS: int = 4
+    RESEARCH_MAX_CONCURRENCY: int = 4
+    # Tools analyzed per structured LLM call; 1 analyzes each tool separately
+    ANALYSIS_BATCH_SIZE: int = 1
+    # Character budgets for condensed page content sent to the LLM
+    ARTICLE_CONTENT_BUDGET: int = 1500
+    ANALYSIS_CONTENT_BUDGET: int = 2500
+    # Character cap on each tool's entry in the recommendation prompt; 0 disables
+    RECOMMENDATION_COMPANY_BUDGET: int = 600
 
 
 @lru_cache()
@@ -0,0 +1,114 @@
+"""Batch research over many queries, one JSONL result line per query."""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from ..config.logging import Logger
+from ..config.settings import get_settings
+from .workflow import Workflow
+
+
+def read_queries(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse query records from JSONL or plain text, one query per line.
+
+    A JSON line must be an object with a "query" field; any other fields
+    (such as an "id") are echoed back in its result. Other lines are taken
+    as the query itself. Blank lines are skipped, and lines that cannot be
+    parsed yield a record with an "error" instead of a query.
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith("{"):
+            yield {"query": line, "line": number}
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"line": number, "error": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record.get("query"), str) or not record["query"].strip():
+            yield {**record, "line": number, "error": "Missing 'query'"}
+            continue
+        yield {**record, "line": number}
+
+
+class BatchRunner:
+    """Runs queries through one shared `Workflow`, a bounded number at a time.
+
+    Records are pulled from the input only as workers free up, and each
+    result is written as soon as its query finishes, so memory stays flat
+    however long the input is. Results are written in completion order.
+    """
+
+    def __init__(self, workflow: Optional[Workflow] = None, concurrency: int = None):
+        """
+        Initialize the batch runner.
+        Args:
+            workflow: Workflow shared by every query; a new one by default.
+            concurrency: Queries researched at once; defaults to BATCH_CONCURRENCY.
+        """
+        self.settings = get_settings()
+        self.logger = Logger().get_logger(name=self.__class__.__name__)
+        self.workflow = workflow or Workflow()
+        self.concurrency = max(1, concurrency or self.settings.BATCH_CONCURRENCY)
+
+    async def _research(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in record:
+            return {**record, "status": "error"}
+
+        started = time.perf_counter()
+        try:
+            result = await self.workflow.arun(record["query"].strip())
+        except Exception as e:
+            self.logger.exception(
+                "Research failed for query '%s': %s", record["query"], e
+            )
+            return {
+                **record,
+                "status": "error",
+                "error": str(e) or e.__class__.__name__,
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+
+        return {
+            **record,
+            "status": "ok",
+            "seconds": round(time.perf_counter() - started, 3),
+            "result": result.model_dump(mode="json", exclude={"pending_analyses"}),
+        }
+
+    async def arun(self, lines: Iterable[str], output: TextIO) -> Dict[str, int]:
+        """Research every query in `lines`, writing results to `output`.
+
+        Returns how many queries succeeded and failed.
+        """
+        records = read_queries(lines)
+        counts = {"ok": 0, "error": 0}
+        # Workers share the generator, one `next` at a time
+        read_lock = asyncio.Lock()
+
+        async def next_record() -> Optional[Dict[str, Any]]:
+            async with read_lock:
+                # Reading may block on a slow pipe, so keep it off the loop
+                return await asyncio.to_thread(next, records, None)
+
+        async def worker():
+            while (record := await next_record()) is not None:
+                outcome = await self._research(record)
+                counts[outcome["status"]] += 1
+                output.write(json.dumps(outcome) + "\n")
+                output.flush()
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self.logger.info(
+            "📦 Batch finished: %d succeeded, %d failed", counts["ok"], counts["error"]
+        )
+        return counts
+
+    def run(self, lines: Iterable[str], output: TextIO) -> Dict[str, int]:
+        return asyncio.run(self.arun(lines, output))
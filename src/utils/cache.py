@@ -0,0 +1,157 @@
+"""SQLite-backed cache with per-entry TTLs and LRU eviction."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from ..config.logging import Logger
+
+# A hit refreshes an entry's LRU timestamp only if it is older than this,
+# and the write is deferred to the next `set`, so reads never commit
+TOUCH_INTERVAL = 60.0
+# Deferred timestamps flushed from `get` anyway once this many pile up
+MAX_PENDING_TOUCHES = 1000
+
+
+class DiskCache:
+    """A small persistent key/value cache shared by the app's services.
+
+    Entries live in a single SQLite table partitioned by namespace. Each
+    namespace holds at most `max_entries` rows; once full, the least
+    recently used entries are evicted. Recency is tracked to within
+    TOUCH_INTERVAL. Expired entries are treated as misses and removed lazily.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 5000):
+        self.logger = Logger().get_logger(name=self.__class__.__name__)
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Key -> access time not yet written to the database
+        self._touched: Dict[str, float] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )"""
+            )
+            self._conn.execute(
+                """CREATE INDEX IF NOT EXISTS idx_cache_entries_lru
+                ON cache_entries (namespace, accessed_at)"""
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                conn.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            if now - accessed_at >= TOUCH_INTERVAL:
+                self._touched[key] = now
+                if len(self._touched) >= MAX_PENDING_TOUCHES:
+                    self._flush_touches(conn)
+                    conn.commit()
+            self._stats["hits"] += 1
+            return value
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        if not self._touched:
+            return
+        conn.executemany(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            [(at, self.namespace, key) for key, at in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store `value` under `key`, expiring after `ttl` seconds if given."""
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            conn = self._connection()
+            # Before eviction, which goes by the stored access times
+            self._flush_touches(conn)
+            conn.execute(
+                """INSERT OR REPLACE INTO cache_entries
+                (namespace, key, value, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)""",
+                (self.namespace, key, value, expires_at, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        (count,) = conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        conn.execute(
+            """DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries WHERE namespace = ?
+                ORDER BY accessed_at ASC LIMIT ?
+            )""",
+            (self.namespace, self.namespace, overflow),
+        )
+        self._stats["evictions"] += overflow
+        self.logger.debug("Evicted %d entries from '%s' cache", overflow, self.namespace)
+
+    def clear(self):
+        """Remove every entry in this cache's namespace."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+            conn.commit()
+            self._touched.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters since this cache was created."""
+        with self._lock:
+            return dict(self._stats)
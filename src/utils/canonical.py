@@ -0,0 +1,114 @@
+"""Canonical tool names and sites, so one tool is researched only once."""
+
+import difflib
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..config.known_tools import KNOWN_TOOLS
+from ..config.settings import get_settings
+from ..config.singleton import Singleton
+from .knowledge import tool_key
+
+# Fuzzy matching is unreliable on very short keys ("neon" vs "xeon")
+MIN_FUZZY_KEY_LENGTH = 5
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]+|\d+[.)])\s*")
+_PARENTHETICAL = re.compile(r"\s*[(\[].*?[)\]]")
+# Page titles such as "Supabase | The Postgres Development Platform"
+_TITLE_SEPARATOR = re.compile(r"\s+[|–—-]\s+|:\s+")
+_DOMAIN_SUFFIX = re.compile(r"\.(?:io|com|dev|app|sh|so|ai|co|org|net|cloud|tech)$", re.I)
+
+
+def clean_tool_name(raw: str) -> str:
+    """Strip list markers, markdown and qualifiers from a name.
+
+    "1. **Supabase.io** (open source)" -> "Supabase.io". Domain suffixes are
+    kept, as for many tools ("Socket.io", "Cal.com") they are the name.
+    """
+    name = _LIST_MARKER.sub("", raw).replace("**", "").replace("`", "")
+    name = _PARENTHETICAL.sub("", name)
+    name = _TITLE_SEPARATOR.split(name, maxsplit=1)[0]
+    return " ".join(name.split()).strip(" .,;")
+
+
+def _bare_key(name: str) -> str:
+    """`tool_key` of `name` without its domain suffix ("Supabase.io" -> "supabase")."""
+    return tool_key(_DOMAIN_SUFFIX.sub("", name))
+
+
+def site_key(url: str) -> str:
+    """Normalized page of `url`: host without "www." plus path, no scheme or query.
+
+    "https://www.supabase.com/docs/" -> "supabase.com/docs". The path is kept
+    because different products often share a domain (aws.amazon.com/rds and
+    aws.amazon.com/dynamodb, or repositories on github.com).
+    """
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[len("www."):]
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" if host else ""
+
+
+class ToolCanonicalizer(metaclass=Singleton):
+    """Maps tool-name variants onto one canonical name.
+
+    A cleaned name resolves through the `KNOWN_TOOLS` alias table by its
+    `tool_key`, then by fuzzy match against the known keys, then the same
+    way without its domain suffix. Names that are not known stay as
+    cleaned, but are still matched against each other, with and without
+    the suffix, when a list is deduplicated.
+    """
+
+    def __init__(self):
+        self.fuzzy_cutoff = get_settings().TOOL_NAME_FUZZY_CUTOFF
+        self._aliases: Dict[str, str] = {}
+        for name, aliases in KNOWN_TOOLS.items():
+            for spelling in (name, *aliases):
+                self._aliases[tool_key(spelling)] = name
+
+    def _closest(self, key: str, candidates: List[str]) -> Optional[str]:
+        if len(key) < MIN_FUZZY_KEY_LENGTH:
+            return None
+        matches = difflib.get_close_matches(
+            key, candidates, n=1, cutoff=self.fuzzy_cutoff
+        )
+        return matches[0] if matches else None
+
+    def _known(self, key: str) -> Optional[str]:
+        if key in self._aliases:
+            return self._aliases[key]
+        closest = self._closest(key, list(self._aliases))
+        return self._aliases[closest] if closest else None
+
+    def canonical(self, raw: str) -> str:
+        name = clean_tool_name(raw)
+        return self._known(tool_key(name)) or self._known(_bare_key(name)) or name
+
+    def dedupe(self, names: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """Canonical names in first-seen order, and each dropped name's survivor."""
+        unique: Dict[str, str] = {}
+        # Suffix-free key of each unique name -> its key in `unique`
+        bare: Dict[str, str] = {}
+        dropped: Dict[str, str] = {}
+        for raw in names:
+            name = self.canonical(raw)
+            key = tool_key(name)
+            if not key:
+                continue
+
+            duplicate = (
+                (key if key in unique else self._closest(key, list(unique)))
+                or bare.get(key)
+                or bare.get(_bare_key(name))
+            )
+            if duplicate:
+                dropped[raw] = unique[duplicate]
+            else:
+                unique[key] = name
+                bare.setdefault(_bare_key(name), key)
+        return list(unique.values()), dropped
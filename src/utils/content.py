@@ -0,0 +1,210 @@
+"""Markdown condensation: keep the most relevant parts of a page within a budget."""
+
+import hashlib
+import re
+from typing import Iterable, List, NamedTuple
+
+# Terms that signal the sections the tool analysis prompt asks about
+ANALYSIS_KEYWORDS = (
+    "pricing",
+    "price",
+    "plan",
+    "free",
+    "tier",
+    "month",
+    "enterprise",
+    "open source",
+    "open-source",
+    "license",
+    "github",
+    "api",
+    "sdk",
+    "graphql",
+    "rest",
+    "cli",
+    "language",
+    "python",
+    "javascript",
+    "typescript",
+    "node",
+    "go",
+    "java",
+    "rust",
+    "ruby",
+    "php",
+    "integration",
+    "integrates",
+    "docker",
+    "kubernetes",
+    "aws",
+    "framework",
+    "database",
+    "developer",
+    "docs",
+)
+
+_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_BARE_URL = re.compile(r"https?://\S+")
+_HEADING = re.compile(r"^#{1,6}\s")
+_BOILERPLATE = re.compile(
+    r"cookie|accept all|privacy policy|terms of (service|use)|all rights reserved"
+    r"|©|skip to (main )?content|subscribe to our newsletter",
+    re.IGNORECASE,
+)
+_NAV_ACTION = re.compile(r"^(sign (in|up)|log ?in|menu|search|toggle)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]*")
+
+
+class Section(NamedTuple):
+    index: int
+    heading: str
+    text: str
+
+
+def _is_link_heavy(line: str) -> bool:
+    links = _LINK.findall(line)
+    if not links:
+        return False
+
+    visible = _LINK.sub(lambda m: m.group(1), line)
+    visible = visible.strip(" \t-*•|>")
+    if not visible:
+        return True
+
+    link_chars = sum(len(text) for text in links)
+    if len(links) >= 2:
+        return link_chars / len(visible) > 0.6
+
+    # A lone short link on its own line is almost always navigation
+    return link_chars >= len(visible) - 2 and len(visible) < 40
+
+
+def strip_boilerplate(markdown: str) -> str:
+    """Drop navigation, cookie banners, footers and link-only lines."""
+    kept = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            kept.append("")
+            continue
+        if re.fullmatch(r"[-*_=|:\s]+", stripped):
+            continue
+        if _is_link_heavy(stripped):
+            continue
+        if len(stripped) < 200 and _BOILERPLATE.search(stripped):
+            continue
+        if len(stripped) < 30 and _NAV_ACTION.match(stripped.lstrip("-*• ")):
+            continue
+
+        line = _LINK.sub(lambda m: m.group(1), line)
+        line = _BARE_URL.sub("", line).rstrip()
+        if line.strip():
+            kept.append(line)
+
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+
+def split_sections(markdown: str) -> List[Section]:
+    """Split markdown on headings, falling back to paragraphs for flat pages."""
+    sections: List[Section] = []
+    heading = ""
+    lines: List[str] = []
+
+    def flush():
+        text = "\n".join(lines).strip()
+        if text:
+            sections.append(Section(len(sections), heading, text))
+
+    for line in markdown.splitlines():
+        if _HEADING.match(line):
+            flush()
+            heading = line.lstrip("#").strip()
+            lines = [line]
+        else:
+            lines.append(line)
+    flush()
+
+    if len(sections) <= 1:
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", markdown) if p.strip()]
+        sections = [Section(i, "", p) for i, p in enumerate(paragraphs)]
+
+    return sections
+
+
+def _score(section: Section, keywords: List[str], total: int) -> float:
+    heading = section.heading.lower()
+    body = section.text.lower()
+    body_words = set(_WORD.findall(body))
+
+    score = 0.0
+    for keyword in keywords:
+        if " " in keyword or "-" in keyword:
+            hits = body.count(keyword)
+        else:
+            hits = 1 if keyword in body_words else 0
+        if hits:
+            score += 1.0 + min(hits, 3) * 0.25
+        if keyword in heading:
+            score += 3.0
+
+    # Favour dense sections and, slightly, the top of the page
+    score /= max(1.0, len(section.text) / 500)
+    score += 0.5 * (1 - section.index / max(1, total))
+    return score
+
+
+def condense_markdown(markdown: str, budget: int, keywords: Iterable[str] = ()) -> str:
+    """Condense `markdown` to at most `budget` characters.
+
+    Boilerplate is stripped, the page is split into sections, and sections
+    are ranked by how many `keywords` they mention. The best sections are
+    packed into the budget and re-emitted in their original page order.
+    """
+    if not markdown:
+        return ""
+
+    cleaned = strip_boilerplate(markdown)
+    if len(cleaned) <= budget:
+        return cleaned
+
+    sections = split_sections(cleaned)
+    keyword_list = list(dict.fromkeys(k.lower() for k in keywords if k))
+    ranked = sorted(
+        sections,
+        key=lambda s: _score(s, keyword_list, len(sections)),
+        reverse=True,
+    )
+
+    chosen: List[Section] = []
+    used = 0
+    for section in ranked:
+        remaining = budget - used
+        cost = len(section.text) + 2
+        if cost <= remaining:
+            chosen.append(section)
+            used += cost
+        elif not chosen or remaining > 200:
+            # Worth a partial section; smaller, lower-ranked ones are skipped
+            chosen.append(section._replace(text=section.text[: remaining - 2]))
+            break
+
+    chosen.sort(key=lambda s: s.index)
+    return "\n\n".join(s.text for s in chosen)[:budget]
+
+
+def query_keywords(*texts: str) -> List[str]:
+    """Lower-cased search terms from free text such as a query or tool name."""
+    terms = []
+    for text in texts:
+        terms.extend(t for t in _WORD.findall(text.lower()) if len(t) > 1)
+    return terms
+
+
+def content_hash(markdown: str) -> str:
+    """Hash of a page's substantive text, stable across layout-only changes.
+
+    Boilerplate, link targets, whitespace and case are normalized away so
+    that a re-scrape of an unchanged page hashes the same.
+    """
+    normalized = " ".join(strip_boilerplate(markdown).lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
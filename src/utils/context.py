@@ -0,0 +1,109 @@
+"""Per-run context shared by every node and service call in a workflow run."""
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from ..config.schemas import OperationTiming
+from ..config.settings import get_settings
+from .tokens import TokenTracker
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when waiting any longer would overrun the run's QUERY_DEADLINE."""
+
+
+_current_run: ContextVar[Optional["RunContext"]] = ContextVar(
+    "codescout_run", default=None
+)
+
+
+class RunTimings:
+    """Thread-safe per-run latency breakdown keyed by operation name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: Dict[str, OperationTiming] = {}
+
+    def record(self, operation: str, seconds: float, failed: bool = False):
+        with self._lock:
+            timing = self._timings.setdefault(operation, OperationTiming())
+            timing.count += 1
+            timing.total_seconds += seconds
+            timing.max_seconds = max(timing.max_seconds, seconds)
+            if failed:
+                timing.errors += 1
+
+    def report(self) -> Dict[str, OperationTiming]:
+        with self._lock:
+            return {
+                operation: timing.model_copy()
+                for operation, timing in sorted(self._timings.items())
+            }
+
+
+class SiteClaims:
+    """Thread-safe record of which tool claimed each site during a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owners: Dict[str, str] = {}
+
+    def claim(self, site: str, tool_name: str) -> Optional[str]:
+        """Claim `site` for `tool_name`; return the earlier owner if it was taken."""
+        with self._lock:
+            owner = self._owners.setdefault(site, tool_name)
+        return None if owner == tool_name else owner
+
+
+def _query_deadline() -> Optional[float]:
+    seconds = get_settings().QUERY_DEADLINE
+    return time.monotonic() + seconds if seconds > 0 else None
+
+
+@dataclass
+class RunContext:
+    """State that belongs to one workflow run rather than to the `Workflow`.
+
+    LangGraph copies context variables into the threads and tasks that run
+    nodes, so anything reachable from here is visible to every branch of
+    the run without being threaded through the graph state.
+    """
+
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    tokens: TokenTracker = field(default_factory=TokenTracker.from_settings)
+    timings: RunTimings = field(default_factory=RunTimings)
+    sites: SiteClaims = field(default_factory=SiteClaims)
+    # `tool_key` -> future or task gathering a tool's research content, started
+    # while the extraction stream is still running (PIPELINED_EXTRACTION)
+    prefetched: Dict[str, Any] = field(default_factory=dict)
+    # `time.monotonic()` value after which the run stops researching
+    deadline: Optional[float] = field(default_factory=_query_deadline)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None if the run has none."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+
+def current_run() -> Optional[RunContext]:
+    """Return the context of the run executing on this thread or task, if any."""
+    return _current_run.get()
+
+
+@contextmanager
+def run_context(context: Optional[RunContext] = None) -> Iterator[RunContext]:
+    """Make `context` (or a fresh one) the current run for the enclosed block."""
+    context = context or RunContext()
+    token = _current_run.set(context)
+    try:
+        yield context
+    finally:
+        _current_run.reset(token)
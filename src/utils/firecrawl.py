@@ -1,43 +1,546 @@
-from firecrawl import FirecrawlApp
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, List, Optional, Set
+from urllib.parse import urlsplit, urlunsplit
 
 from ..config.settings import get_settings
 from ..config.logging import Logger
+from .cache import DiskCache
+from .context import current_run
+from .metrics import Metrics, record_fallback, timed
+from .ratelimit import RateLimiters
+
+if TYPE_CHECKING:
+    from firecrawl import AsyncFirecrawlApp, FirecrawlApp
+    from firecrawl.v2.types import Document, SearchData
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, parts.query, "")
+    )
 
 
 class FirecrawlService:
-    def __init__(self):
+    def __init__(self, app=None, async_app=None):
+        """
+        Initialize the Firecrawl clients.
+        Args:
+            app: Sync client to use instead of `FirecrawlApp`, e.g. a local replay stub.
+            async_app: Async client to use instead of `AsyncFirecrawlApp`.
+        """
         self.settings = get_settings()
         self.logger = Logger().get_logger(name=self.__class__.__name__)
 
-        api_key = self.settings.FIRECRAWL_API_KEY
-
-        if not api_key:
+        if (app is None or async_app is None) and not self.settings.FIRECRAWL_API_KEY:
             raise ValueError("Missing FIRECRAWL_API_KEY")
 
-        self.app = FirecrawlApp(api_key=api_key)
+        # Injected clients shadow the lazily built ones below
+        if app is not None:
+            self.app = app
+        if async_app is not None:
+            self.async_app = async_app
+        self.limiter = RateLimiters().get("firecrawl")
+        # Abandoned async scrapes keep running to fill the cache
+        self._background: Set[asyncio.Task] = set()
+
+        self.cache: Optional[DiskCache] = None
+        if self.settings.CACHE_ENABLED:
+            self.cache = DiskCache(
+                self.settings.CACHE_PATH,
+                namespace="firecrawl",
+                max_entries=self.settings.CACHE_MAX_ENTRIES,
+            )
+
+        # Last scraped copy of each page with its modification time, kept
+        # past the scrape TTL so an unchanged page need not be scraped again
+        self.pages: Optional[DiskCache] = None
+        if self.settings.CACHE_ENABLED and self.settings.PAGE_REVALIDATION:
+            self.pages = DiskCache(
+                self.settings.CACHE_PATH,
+                namespace="pages",
+                max_entries=self.settings.CACHE_MAX_ENTRIES,
+            )
+
+    @cached_property
+    def app(self) -> FirecrawlApp:
+        # The SDK takes a noticeable share of startup to import, so it is
+        # only loaded once the first request needs a client
+        from firecrawl import FirecrawlApp
+
+        return FirecrawlApp(api_key=self.settings.FIRECRAWL_API_KEY)
+
+    @cached_property
+    def async_app(self) -> AsyncFirecrawlApp:
+        from firecrawl import AsyncFirecrawlApp
+
+        return AsyncFirecrawlApp(api_key=self.settings.FIRECRAWL_API_KEY)
+
+    @cached_property
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=2 * max(1, self.settings.FIRECRAWL_MAX_CONCURRENCY),
+            thread_name_prefix="scrape",
+        )
+
+    def _search_cache_key(self, query: str, num_results: int) -> str:
+        return f"search:{num_results}:{_normalize_query(query)}"
+
+    def _scrape_cache_key(self, url: str) -> str:
+        return f"scrape:{_normalize_url(url)}"
+
+    def _cached_search(self, query: str, cache_key: str) -> Optional[SearchData]:
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                from firecrawl.v2.types import SearchData
+
+                self.logger.debug("Search cache hit for query '%s'", query)
+                return SearchData.model_validate_json(cached)
+        return None
+
+    def _cached_scrape(self, url: str, cache_key: str) -> Optional[Document]:
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                from firecrawl.v2.types import Document
+
+                self.logger.debug("Scrape cache hit for %s", url)
+                return Document.model_validate_json(cached)
+        return None
+
+    def _store_search(self, cache_key: str, result):
+        from firecrawl.v2.types import SearchData
+
+        if self.cache and isinstance(result, SearchData):
+            self.cache.set(
+                cache_key, result.model_dump_json(), ttl=self.settings.CACHE_SEARCH_TTL
+            )
+
+    def _store_scrape(self, cache_key: str, result):
+        from firecrawl.v2.types import Document
+
+        if self.cache and isinstance(result, Document):
+            self.cache.set(
+                cache_key, result.model_dump_json(), ttl=self.settings.CACHE_SCRAPE_TTL
+            )
+
+    def _check_page(self, url: str, last_modified: str) -> Optional[int]:
+        """Conditionally HEAD `url`; the status code, or None if unreachable."""
+        headers = {"User-Agent": "CodeScout/0.1", "If-Modified-Since": last_modified}
+        request = urllib.request.Request(url, method="HEAD", headers=headers)
+
+        with timed("page.check"):
+            try:
+                with urllib.request.urlopen(
+                    request, timeout=self.settings.PAGE_CHECK_TIMEOUT
+                ) as response:
+                    return response.status
+            except urllib.error.HTTPError as e:
+                # urllib raises for every non-2xx status, including 304
+                return e.code
+            except (OSError, ValueError) as e:
+                self.logger.debug("Page check failed for %s: %s", url, e)
+                return None
+
+    def _revalidate(self, url: str) -> Optional[Document]:
+        """Return the last scraped copy of `url` if its site says it is current.
+
+        Only pages stored with a modification time are checked, with a
+        conditional HEAD, so a cold scrape never waits on the site. A page
+        whose check fails or is refused is stored without one and not
+        checked again.
+        """
+        if not self.pages:
+            return None
+
+        key = _normalize_url(url)
+        stored = self.pages.get(key)
+        record = json.loads(stored) if stored else None
+        if not record or not record.get("last_modified"):
+            return None
+
+        status = self._check_page(url, record["last_modified"])
+        if status is None or status >= 400:
+            self.pages.set(key, json.dumps({**record, "last_modified": None}))
+            return None
+        if status != 304:
+            return None
+
+        from firecrawl.v2.types import Document
+
+        self.logger.debug("%s not modified since it was last scraped", url)
+        return Document.model_validate_json(record["document"])
+
+    def _page_last_modified(self, result: Document) -> Optional[str]:
+        """A scraped page's modification time as an HTTP date, if it declares one.
+
+        Firecrawl passes no response headers through, so ETag and
+        Last-Modified are unavailable; the page's own modification time
+        (`metadata.modified_time`, from `article:modified_time` and the
+        like) is the only validator.
+        """
+        metadata = result.metadata
+        if not (metadata and metadata.modified_time):
+            return None
+        try:
+            modified = datetime.fromisoformat(metadata.modified_time)
+        except ValueError:
+            return None
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        return format_datetime(modified.astimezone(timezone.utc), usegmt=True)
+
+    def _store_page(self, url: str, result):
+        from firecrawl.v2.types import Document
+
+        if not (self.pages and isinstance(result, Document)):
+            return
+        last_modified = self._page_last_modified(result)
+        # Pages without a modification time would never be revalidated
+        if not last_modified:
+            return
+        key = _normalize_url(url)
+        stored = self.pages.get(key)
+        if stored and not json.loads(stored).get("last_modified"):
+            # The site refused or failed a check before; do not try again
+            return
+        self.pages.set(
+            key,
+            json.dumps(
+                {"last_modified": last_modified, "document": result.model_dump_json()}
+            ),
+        )
 
     def search_companies(self, query: str, num_results: int = 5):
+        cache_key = self._search_cache_key(query, num_results)
+        cached = self._cached_search(query, cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self.limiter.call(
+                "firecrawl.search",
+                self.app.search,
+                query=f"{query} company pricing",
+                limit=num_results,
+                scrape_options={"formats": ["markdown"]},
+            )
+            self.logger.debug("Search successful. Result type: %s", type(result))
+        except Exception as e:
+            self.logger.exception("Search failed for query '%s': %s", query, e)
+            return []
+
+        self._store_search(cache_key, result)
+        return result
+
+    async def asearch_companies(self, query: str, num_results: int = 5):
+        cache_key = self._search_cache_key(query, num_results)
+        cached = self._cached_search(query, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.app.search(
+            result = await self.limiter.acall(
+                "firecrawl.search",
+                self.async_app.search,
                 query=f"{query} company pricing",
                 limit=num_results,
                 scrape_options={"formats": ["markdown"]},
             )
-            self.logger.debug(f"Search successful. Result type: {type(result)}")
-            return result
+            self.logger.debug("Search successful. Result type: %s", type(result))
         except Exception as e:
-            self.logger.exception(f"Search failed for query '{query}': {e}")
+            self.logger.exception("Search failed for query '%s': %s", query, e)
             return []
 
-    def scrape_company_page(self, url: str):
+        self._store_search(cache_key, result)
+        return result
+
+    def scrape_company_page(self, url: str, has_fallback: bool = False):
+        """Scrape `url`, hedging against slow responses when SCRAPE_HEDGING is on.
+
+        A scrape still running `_hedge_delay` after the rate limiter let it
+        through is abandoned (returning None) if the caller `has_fallback`
+        content, and otherwise raced against a backup request unless the
+        limiter has no spare capacity. Abandoned scrapes still fill the cache.
+        """
+        cache_key = self._scrape_cache_key(url)
+        cached = self._cached_scrape(url, cache_key)
+        if cached is not None:
+            return cached
+
+        unchanged = self._revalidate(url)
+        if unchanged is not None:
+            self._store_scrape(cache_key, unchanged)
+            return unchanged
+
+        if not self.settings.SCRAPE_HEDGING:
+            return self._fetch_page(url, cache_key)
+
+        timeout = self._scrape_timeout()
+        admitted = threading.Event()
+        queued_at = time.monotonic()
+        primary = self._submit(
+            lambda: self._fetch_page(url, cache_key, admitted)
+        )
+        # Time queued in the rate limiter is not the site being slow, so the
+        # hedge timer only starts once the request is actually sent
+        if not admitted.wait(timeout):
+            self._log_queued(url, timeout)
+            return None
+        timeout -= time.monotonic() - queued_at
+        delay = min(self._hedge_delay(), timeout)
+
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+        if has_fallback:
+            self._log_hedge(url, delay, "falling back to search content")
+            return None
+        if delay >= timeout:
+            self.logger.warning("⏱️ Giving up on scraping %s after %.1fs", url, timeout)
+            return None
+        if not self.limiter.has_capacity():
+            # A backup would queue behind the same limit and pay twice
+            self._log_hedge(url, delay, "rate limit reached, not sending a backup")
+            return self._first_result(url, [primary], timeout - delay)
+
+        self._log_hedge(url, delay, "sending a backup request")
+        backup = self._submit(lambda: self._fetch_page(url, cache_key))
+        return self._first_result(url, [primary, backup], timeout - delay)
+
+    async def ascrape_company_page(self, url: str, has_fallback: bool = False):
+        cache_key = self._scrape_cache_key(url)
+        cached = self._cached_scrape(url, cache_key)
+        if cached is not None:
+            return cached
+
+        unchanged = await asyncio.to_thread(self._revalidate, url)
+        if unchanged is not None:
+            self._store_scrape(cache_key, unchanged)
+            return unchanged
+
+        if not self.settings.SCRAPE_HEDGING:
+            return await self._afetch_page(url, cache_key)
+
+        timeout = self._scrape_timeout()
+        admitted = asyncio.Event()
+        queued_at = time.monotonic()
+        primary = self._spawn(self._afetch_page(url, cache_key, admitted))
+        try:
+            await asyncio.wait_for(admitted.wait(), timeout)
+        except asyncio.TimeoutError:
+            self._log_queued(url, timeout)
+            return None
+        timeout -= time.monotonic() - queued_at
+        delay = min(self._hedge_delay(), timeout)
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        if has_fallback:
+            self._log_hedge(url, delay, "falling back to search content")
+            return None
+        if delay >= timeout:
+            self.logger.warning("⏱️ Giving up on scraping %s after %.1fs", url, timeout)
+            return None
+        if not self.limiter.has_capacity():
+            self._log_hedge(url, delay, "rate limit reached, not sending a backup")
+            return await self._afirst_result(url, [primary], timeout - delay)
+
+        self._log_hedge(url, delay, "sending a backup request")
+        backup = self._spawn(self._afetch_page(url, cache_key))
+        return await self._afirst_result(url, [primary, backup], timeout - delay)
+
+    def _fetch_page(
+        self,
+        url: str,
+        cache_key: str,
+        admitted: Optional[threading.Event] = None,
+    ):
+        """Scrape through the rate limiter, setting `admitted` once it is sent.
+
+        `admitted` is also set if the scrape ends without being sent, so
+        nobody waits on it forever.
+        """
+
+        def send(**kwargs):
+            if admitted:
+                admitted.set()
+            return self.app.scrape(**kwargs)
+
+        try:
+            result = self.limiter.call(
+                "firecrawl.scrape", send, url=url, formats=["markdown"]
+            )
+            self._log_scrape(url, result)
+        except Exception as e:
+            self.logger.exception("Scrape failed for %s: %s", url, e)
+            return None
+        finally:
+            if admitted:
+                admitted.set()
+
+        self._store_scrape(cache_key, result)
+        self._store_page(url, result)
+        return result
+
+    async def _afetch_page(
+        self,
+        url: str,
+        cache_key: str,
+        admitted: Optional[asyncio.Event] = None,
+    ):
+        async def send(**kwargs):
+            if admitted:
+                admitted.set()
+            return await self.async_app.scrape(**kwargs)
+
         try:
-            result = self.app.scrape(url=url, formats=["markdown"])
-            self.logger.debug(
-                f"Scrape successful for {url}. Result type: {type(result)}"
+            result = await self.limiter.acall(
+                "firecrawl.scrape", send, url=url, formats=["markdown"]
             )
-            if hasattr(result, "markdown"):
-                self.logger.debug(f"Markdown length: {len(result.markdown)} chars")
-            return result
+            self._log_scrape(url, result)
         except Exception as e:
-            self.logger.exception(f"Scrape failed for {url}: {e}")
+            self.logger.exception("Scrape failed for %s: %s", url, e)
             return None
+        finally:
+            if admitted:
+                admitted.set()
+
+        self._store_scrape(cache_key, result)
+        self._store_page(url, result)
+        return result
+
+    def _hedge_delay(self) -> float:
+        """Observed p95 scrape latency, or SCRAPE_TIMEOUT until enough samples."""
+        metrics = Metrics()
+        if metrics.count("firecrawl.scrape") < self.settings.SCRAPE_HEDGE_MIN_SAMPLES:
+            return self.settings.SCRAPE_TIMEOUT
+        return max(
+            self.settings.SCRAPE_HEDGE_MIN_DELAY,
+            metrics.quantile("firecrawl.scrape", 0.95),
+        )
+
+    def _scrape_timeout(self) -> float:
+        """SCRAPE_TIMEOUT, cut short by the current run's deadline."""
+        run = current_run()
+        remaining = run.remaining() if run else None
+        if remaining is None:
+            return self.settings.SCRAPE_TIMEOUT
+        return min(self.settings.SCRAPE_TIMEOUT, remaining)
+
+    def _log_queued(self, url: str, timeout: float):
+        record_fallback("firecrawl.scrape.queued")
+        if timeout < self.settings.SCRAPE_TIMEOUT:
+            # `_scrape_timeout` was cut short by the run's deadline
+            self.logger.warning(
+                "⏰ Giving up on scraping %s, query deadline reached while rate limited",
+                url,
+            )
+            return
+        self.logger.warning(
+            "⏱️ Giving up on scraping %s, still rate limited after %.1fs", url, timeout
+        )
+
+    def _log_hedge(self, url: str, delay: float, action: str):
+        record_fallback("firecrawl.scrape.hedge")
+        self.logger.warning("⏱️ Scrape of %s exceeded %.1fs, %s", url, delay, action)
+
+    def _submit(self, fn: Callable) -> Future:
+        # Carry the run context (deadline, timings) into the pool thread
+        return self._hedge_pool.submit(contextvars.copy_context().run, fn)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def _first_result(self, url: str, futures: List[Future], timeout: float):
+        deadline = time.monotonic() + timeout
+        pending = set(futures)
+        while pending:
+            remaining = max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.result() is not None:
+                    return future.result()
+
+        self.logger.warning("⏱️ Giving up on scraping %s, no response in time", url)
+        return None
+
+    async def _afirst_result(self, url: str, tasks: List[asyncio.Task], timeout: float):
+        deadline = time.monotonic() + timeout
+        pending = set(tasks)
+        while pending:
+            remaining = max(0.0, deadline - time.monotonic())
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                if task.result() is not None:
+                    return task.result()
+
+        self.logger.warning("⏱️ Giving up on scraping %s, no response in time", url)
+        return None
+
+    def _log_scrape(self, url: str, result):
+        self.logger.debug("Scrape successful for %s. Result type: %s", url, type(result))
+        if hasattr(result, "markdown"):
+            self.logger.debug("Markdown length: %d chars", len(result.markdown))
+
+    def scrape_company_pages(self, urls: List[str]):
+        """Scrape several pages concurrently, returning results in input order.
+
+        Each URL goes through `scrape_company_page`, so a failed scrape yields
+        None in its slot instead of aborting the batch.
+        """
+        if not urls:
+            return []
+
+        # Each worker runs in a copy of the caller's context so per-run
+        # state (timings, token budgets) follows the scrape into the pool
+        contexts = [contextvars.copy_context() for _ in urls]
+        max_workers = max(1, min(self.settings.SCRAPE_MAX_WORKERS, len(urls)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda context, url: context.run(self.scrape_company_page, url),
+                    contexts,
+                    urls,
+                )
+            )
+
+    async def ascrape_company_pages(self, urls: List[str]):
+        """Async counterpart of `scrape_company_pages`, bounded by a semaphore."""
+        semaphore = asyncio.Semaphore(max(1, self.settings.SCRAPE_MAX_WORKERS))
+
+        async def scrape(url: str):
+            async with semaphore:
+                return await self.ascrape_company_page(url)
+
+        return await asyncio.gather(*(scrape(url) for url in urls))
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache else {}
@@ -0,0 +1,147 @@
+"""Persistent store of researched tools, reused across queries while fresh."""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from ..config.logging import Logger
+from ..config.schemas import CompanyAnalysis, CompanyInfo
+
+
+def _page_key(url: str) -> str:
+    return url.strip().rstrip("/")
+
+
+def tool_key(name: str) -> str:
+    """Canonical lookup key for a tool name ("Planet Scale" -> "planetscale")."""
+    return re.sub(r"[^a-z0-9]+", "", name.lower())
+
+
+class ToolKnowledgeBase:
+    """SQLite table of analyzed `CompanyInfo` records keyed by tool name.
+
+    Each record keeps the source URL and the time it was researched. A
+    record older than `max_age` seconds is stale: `get` ignores it, but it
+    stays in the table until the tool is researched again.
+
+    A second table maps each analyzed page URL to the hash of the content
+    that was analyzed and the resulting `CompanyAnalysis`, so a re-scraped
+    page whose content has not changed needs no new analysis.
+    """
+
+    def __init__(self, path: str, max_age: float):
+        self.logger = Logger().get_logger(name=self.__class__.__name__)
+        self.path = path
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "unchanged_pages": 0,
+            "changed_pages": 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS tools (
+                    key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    source_url TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    researched_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS page_analyses (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    analyzed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, name: str) -> Optional[CompanyInfo]:
+        """Return the stored record for `name` if it is still fresh."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT record, researched_at FROM tools WHERE key = ?",
+                (tool_key(name),),
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            record, researched_at = row
+            if time.time() - researched_at > self.max_age:
+                self._stats["stale"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["hits"] += 1
+        return CompanyInfo.model_validate_json(record)
+
+    def put(self, company: CompanyInfo):
+        """Store `company` as researched now, replacing any older record."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """INSERT OR REPLACE INTO tools
+                (key, name, source_url, record, researched_at)
+                VALUES (?, ?, ?, ?, ?)""",
+                (
+                    tool_key(company.name),
+                    company.name,
+                    company.website,
+                    company.model_dump_json(),
+                    time.time(),
+                ),
+            )
+            conn.commit()
+
+    def is_fresh(self, name: str) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT researched_at FROM tools WHERE key = ?", (tool_key(name),)
+            ).fetchone()
+        return row is not None and time.time() - row[0] <= self.max_age
+
+    def page_analysis(self, url: str, content_hash: str) -> Optional[CompanyAnalysis]:
+        """Return the analysis of `url` if it was made from the same content."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT analysis FROM page_analyses WHERE url = ? AND content_hash = ?",
+                (_page_key(url), content_hash),
+            ).fetchone()
+            self._stats["unchanged_pages" if row else "changed_pages"] += 1
+        return CompanyAnalysis.model_validate_json(row[0]) if row else None
+
+    def put_page_analysis(self, url: str, content_hash: str, analysis: CompanyAnalysis):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """INSERT OR REPLACE INTO page_analyses
+                (url, content_hash, analysis, analyzed_at) VALUES (?, ?, ?, ?)""",
+                (_page_key(url), content_hash, analysis.model_dump_json(), time.time()),
+            )
+            conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return lookup counters since this store was opened."""
+        with self._lock:
+            return dict(self._stats)
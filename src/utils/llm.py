@@ -1,12 +1,389 @@
 """Groq LLMs module for LangChain integration."""
 
-from typing import Optional
+from __future__ import annotations
 
-from langchain_groq import ChatGroq
+import asyncio
+import contextvars
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import cached_property
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
 
 from ..config.logging import Logger
 from ..config.settings import get_settings
 from ..config.singleton import Singleton
+from .cache import DiskCache
+from .context import DeadlineExceeded, current_run
+from .metrics import timed
+from .ratelimit import RateLimiter, RateLimiters
+from .tokens import estimate_prompt_tokens, estimate_tokens, usage_from_response
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, BaseMessage
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def _remaining() -> Optional[float]:
+    run = current_run()
+    return run.remaining() if run else None
+
+
+def _deadline_exceeded(operation: str) -> DeadlineExceeded:
+    return DeadlineExceeded(f"Query deadline reached during {operation}")
+
+
+def _check_deadline(operation: str):
+    run = current_run()
+    if run and run.expired():
+        raise _deadline_exceeded(operation)
+
+
+def _timed_iter(operation: str, items: Iterator) -> Iterator:
+    with timed(operation):
+        yield from items
+
+
+async def _atimed_iter(operation: str, items: AsyncIterator) -> AsyncIterator:
+    with timed(operation):
+        async for item in items:
+            yield item
+
+
+class MemoizedLLM:
+    """Chat model wrapper that memoizes responses in a `DiskCache`.
+
+    Keys cover the model name, temperature, message contents and, for
+    structured calls, the output schema. Raw completions are stored as text
+    and structured results as their JSON dump. Failed calls are never cached.
+
+    Every call is attributed to a workflow `stage`; when a run context is
+    active, its token budget is checked before sending and usage recorded
+    after. Provider calls go through `limiter` when one is given, and
+    completions are abandoned with `DeadlineExceeded` once the run's
+    deadline passes; streams are checked between chunks.
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        model: str,
+        temperature: float,
+        cache: Optional[DiskCache] = None,
+        ttl: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.logger = Logger().get_logger(self.__class__.__name__)
+        self.llm = llm
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+        self.ttl = ttl
+        self.limiter = limiter
+
+    @cached_property
+    def _deadline_pool(self) -> ThreadPoolExecutor:
+        # Sync calls cannot be interrupted, so they run here while the
+        # caller waits only as long as the run's deadline allows
+        return ThreadPoolExecutor(thread_name_prefix="llm")
+
+    def _send(self, operation: str, fn, *args):
+        if self.limiter:
+            return self.limiter.call(operation, fn, *args)
+        with timed(operation):
+            return fn(*args)
+
+    async def _asend(self, operation: str, fn, *args):
+        if self.limiter:
+            return await self.limiter.acall(operation, fn, *args)
+        with timed(operation):
+            return await fn(*args)
+
+    def _call(self, operation: str, fn, *args):
+        remaining = _remaining()
+        if remaining is None:
+            return self._send(operation, fn, *args)
+
+        future = self._deadline_pool.submit(
+            contextvars.copy_context().run, self._send, operation, fn, *args
+        )
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeout:
+            # A timeout raised by the call itself is not the deadline's
+            if future.done():
+                raise
+            raise _deadline_exceeded(operation) from None
+
+    async def _acall(self, operation: str, fn, *args):
+        try:
+            async with asyncio.timeout(_remaining()) as scope:
+                return await self._asend(operation, fn, *args)
+        except TimeoutError:
+            if scope.expired():
+                raise _deadline_exceeded(operation) from None
+            raise
+
+    def _stream(self, operation: str, fn, *args) -> Iterator:
+        if self.limiter:
+            chunks = self.limiter.stream(operation, fn, *args)
+        else:
+            chunks = _timed_iter(operation, fn(*args))
+        try:
+            for chunk in chunks:
+                _check_deadline(operation)
+                yield chunk
+        finally:
+            # Release the limiter's slot now rather than when collected
+            chunks.close()
+
+    async def _astream(self, operation: str, fn, *args) -> AsyncIterator:
+        if self.limiter:
+            chunks = self.limiter.astream(operation, fn, *args)
+        else:
+            chunks = _atimed_iter(operation, fn(*args))
+        try:
+            async for chunk in chunks:
+                _check_deadline(operation)
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    def _cache_key(self, kind: str, messages: List[BaseMessage]) -> str:
+        payload = json.dumps(
+            {
+                "model": self.model,
+                "temperature": self.temperature,
+                "kind": kind,
+                "messages": [(m.type, m.content) for m in messages],
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cached_text(self, key: str, stage: str) -> Optional[AIMessage]:
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                from langchain_core.messages import AIMessage
+
+                self.logger.debug("LLM cache hit for text completion")
+                self._record_cache_hit(stage)
+                return AIMessage(content=cached)
+        return None
+
+    def _cached_structured(
+        self, key: str, schema: Type[SchemaT], stage: str
+    ) -> Optional[SchemaT]:
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.logger.debug("LLM cache hit for %s", schema.__name__)
+                self._record_cache_hit(stage)
+                return schema.model_validate_json(cached)
+        return None
+
+    def _store(self, key: str, value: str):
+        if self.cache:
+            self.cache.set(key, value, ttl=self.ttl)
+
+    def _record_cache_hit(self, stage: str):
+        run = current_run()
+        if run:
+            run.tokens.record_cache_hit(stage)
+
+    def _reserve(self, stage: str, messages: List[BaseMessage]) -> int:
+        estimate = estimate_prompt_tokens(messages)
+        run = current_run()
+        if run:
+            run.tokens.reserve(stage, estimate)
+        return estimate
+
+    def _release(self, stage: str, estimate: int):
+        run = current_run()
+        if run:
+            run.tokens.release(stage, estimate)
+
+    def _record(
+        self,
+        stage: str,
+        estimate: int,
+        raw: Optional[AIMessage],
+        completion: str,
+    ):
+        run = current_run()
+        if not run:
+            return
+
+        usage = usage_from_response(raw)
+        if usage:
+            run.tokens.record(stage, *usage, reserved=estimate)
+        else:
+            run.tokens.record(
+                stage,
+                estimate,
+                estimate_tokens(completion),
+                reserved=estimate,
+                estimated=True,
+            )
+
+    def _parse_structured(self, stage: str, estimate: int, result, schema):
+        raw = result.get("raw")
+        completion = str(getattr(raw, "content", "") or "")
+        if not completion and getattr(raw, "tool_calls", None):
+            completion = json.dumps([call["args"] for call in raw.tool_calls])
+        self._record(stage, estimate, raw, completion)
+
+        parsed = result.get("parsed")
+        if result.get("parsing_error") or parsed is None:
+            raise ValueError(
+                f"Failed to parse {schema.__name__}: {result.get('parsing_error')}"
+            )
+        return parsed
+
+    def invoke(self, messages: List[BaseMessage], stage: str = "default") -> AIMessage:
+        """Invoke the model, returning a cached completion when available."""
+        key = self._cache_key("text", messages)
+        cached = self._cached_text(key, stage)
+        if cached is not None:
+            return cached
+
+        estimate = self._reserve(stage, messages)
+        try:
+            response = self._call("llm.invoke", self.llm.invoke, messages)
+        except Exception:
+            self._release(stage, estimate)
+            raise
+
+        self._record(stage, estimate, response, response.content)
+        self._store(key, response.content)
+        return response
+
+    async def ainvoke(
+        self, messages: List[BaseMessage], stage: str = "default"
+    ) -> AIMessage:
+        key = self._cache_key("text", messages)
+        cached = self._cached_text(key, stage)
+        if cached is not None:
+            return cached
+
+        estimate = self._reserve(stage, messages)
+        try:
+            response = await self._acall("llm.invoke", self.llm.ainvoke, messages)
+        except Exception:
+            self._release(stage, estimate)
+            raise
+
+        self._record(stage, estimate, response, response.content)
+        self._store(key, response.content)
+        return response
+
+    def stream(
+        self, messages: List[BaseMessage], stage: str = "default"
+    ) -> Iterator[str]:
+        """Yield the completion text as it arrives.
+
+        Shares the cache with `invoke`; a cached completion is yielded whole.
+        """
+        key = self._cache_key("text", messages)
+        cached = self._cached_text(key, stage)
+        if cached is not None:
+            yield cached.content
+            return
+
+        estimate = self._reserve(stage, messages)
+        response = None
+        try:
+            for chunk in self._stream("llm.stream", self.llm.stream, messages):
+                response = chunk if response is None else response + chunk
+                if chunk.content:
+                    yield chunk.content
+        except Exception:
+            self._release(stage, estimate)
+            raise
+
+        completion = response.content if response is not None else ""
+        self._record(stage, estimate, response, completion)
+        self._store(key, completion)
+
+    async def astream(
+        self, messages: List[BaseMessage], stage: str = "default"
+    ) -> AsyncIterator[str]:
+        key = self._cache_key("text", messages)
+        cached = self._cached_text(key, stage)
+        if cached is not None:
+            yield cached.content
+            return
+
+        estimate = self._reserve(stage, messages)
+        response = None
+        try:
+            async for chunk in self._astream("llm.stream", self.llm.astream, messages):
+                response = chunk if response is None else response + chunk
+                if chunk.content:
+                    yield chunk.content
+        except Exception:
+            self._release(stage, estimate)
+            raise
+
+        completion = response.content if response is not None else ""
+        self._record(stage, estimate, response, completion)
+        self._store(key, completion)
+
+    def invoke_structured(
+        self,
+        messages: List[BaseMessage],
+        schema: Type[SchemaT],
+        stage: str = "default",
+    ) -> SchemaT:
+        """Invoke the model with structured output parsed into `schema`."""
+        key = self._cache_key(f"structured:{schema.__name__}", messages)
+        cached = self._cached_structured(key, schema, stage)
+        if cached is not None:
+            return cached
+
+        estimate = self._reserve(stage, messages)
+        try:
+            structured = self.llm.with_structured_output(schema, include_raw=True)
+            result = self._call("llm.structured", structured.invoke, messages)
+        except Exception:
+            self._release(stage, estimate)
+            raise
+
+        parsed = self._parse_structured(stage, estimate, result, schema)
+        self._store(key, parsed.model_dump_json())
+        return parsed
+
+    async def ainvoke_structured(
+        self,
+        messages: List[BaseMessage],
+        schema: Type[SchemaT],
+        stage: str = "default",
+    ) -> SchemaT:
+        key = self._cache_key(f"structured:{schema.__name__}", messages)
+        cached = self._cached_structured(key, schema, stage)
+        if cached is not None:
+            return cached
+
+        estimate = self._reserve(stage, messages)
+        try:
+            structured = self.llm.with_structured_output(schema, include_raw=True)
+            result = await self._acall("llm.structured", structured.ainvoke, messages)
+        except Exception:
+            self._release(stage, estimate)
+            raise
+
+        parsed = self._parse_structured(stage, estimate, result, schema)
+        self._store(key, parsed.model_dump_json())
+        return parsed
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache else {}
 
 
 class GroqLLM(metaclass=Singleton):
@@ -32,15 +409,46 @@ class GroqLLM(metaclass=Singleton):
         self.streaming = streaming
         self.max_tokens = max_tokens
 
-    def get_llm(self):
-        """Get the Groq LLM instance."""
-        self.logger.debug(f"Initializing Groq LLM with model: {self.model}")
+    def get_llm(self, streaming: Optional[bool] = None):
+        """Get the Groq LLM instance.
+
+        Args:
+            streaming (bool): Overrides the instance's `streaming` flag.
+        """
+        from langchain_groq import ChatGroq
+
+        self.logger.debug("Initializing Groq LLM with model: %s", self.model)
 
         return ChatGroq(
             model=self.model,
             temperature=self.temperature,
-            streaming=self.streaming,
+            streaming=self.streaming if streaming is None else streaming,
             max_tokens=self.max_tokens,
+            # Retries are left to the shared rate limiter, which backs off
+            # across all callers instead of per request
+            max_retries=0,
+        )
+
+    def get_cached_llm(self, streaming: Optional[bool] = None) -> MemoizedLLM:
+        """Get the Groq LLM wrapped with response memoization.
+
+        Memoization is skipped entirely when `LLM_CACHE_ENABLED` is off.
+        """
+        cache = None
+        if self.settings.LLM_CACHE_ENABLED:
+            cache = DiskCache(
+                self.settings.CACHE_PATH,
+                namespace="llm",
+                max_entries=self.settings.LLM_CACHE_MAX_ENTRIES,
+            )
+
+        return MemoizedLLM(
+            self.get_llm(streaming=streaming),
+            model=self.model,
+            temperature=self.temperature,
+            cache=cache,
+            ttl=self.settings.LLM_CACHE_TTL,
+            limiter=RateLimiters().get("groq"),
         )
 
 
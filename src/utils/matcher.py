@@ -0,0 +1,184 @@
+"""Multi-pattern matching of known developer-tool names in article text."""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from ..config.known_tools import HINT_ONLY_TOOLS, KNOWN_TOOLS
+from ..config.singleton import Singleton
+
+# Weight of a mention in a heading or bold text relative to one in prose
+PROMINENT_WEIGHT = 3
+# Weight of each additional article mentioning a tool
+ARTICLE_WEIGHT = 2
+
+_PROMINENT_LINE = re.compile(r"^\s*(#{1,6}\s|[-*+]\s+\*\*|\d+\.\s+\*\*|\*\*)")
+_BOLD = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton finding every occurrence of many patterns.
+
+    One pass over the text reports all (start, end, pattern) occurrences,
+    however many patterns there are. Matching is on lower-cased text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern.lower())
+        self._link()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append(pattern)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        state = 0
+        # Lower-case per character so indices line up with the original text
+        for index, char in enumerate(text):
+            char = char.lower()
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._output[state]:
+                yield index - len(pattern) + 1, index + 1, pattern
+
+
+@dataclass
+class ToolMatch:
+    """How often, how prominently and in how many articles a tool appears."""
+
+    name: str
+    mentions: int = 0
+    prominent: int = 0
+    articles: int = 0
+    hint_only: bool = False
+
+    @property
+    def score(self) -> int:
+        return (
+            self.mentions
+            + (PROMINENT_WEIGHT - 1) * self.prominent
+            + ARTICLE_WEIGHT * max(0, self.articles - 1)
+        )
+
+    @property
+    def confident(self) -> bool:
+        """Featured in a heading or bold text, and not a hint-only technology.
+
+        Appearing in several articles is not enough on its own: that is
+        just as true of a word repeated down a table column.
+        """
+        return self.prominent > 0 and not self.hint_only
+
+
+class KnownToolMatcher(metaclass=Singleton):
+    """Finds tools from `KNOWN_TOOLS` in text and ranks them by prominence.
+
+    A match must sit on word boundaries and, unless it is spelled exactly
+    as listed, start with a capital letter, so ordinary words that double
+    as tool names ("render", "railway") do not count. Overlapping matches
+    keep the longest, e.g. "GitHub Actions" rather than "GitHub". Tools in
+    `hint_only` are ranked but never count as confident.
+    """
+
+    def __init__(
+        self,
+        tools: Dict[str, Tuple[str, ...]] = KNOWN_TOOLS,
+        hint_only: Iterable[str] = HINT_ONLY_TOOLS,
+    ):
+        self._hint_only = set(hint_only)
+        self._names: Dict[str, str] = {}
+        self._spellings: Dict[str, Set[str]] = {}
+        for name, aliases in tools.items():
+            for spelling in (name, *aliases):
+                key = spelling.lower()
+                self._names[key] = name
+                self._spellings.setdefault(key, set()).add(spelling)
+
+        self._automaton = AhoCorasick(self._names)
+
+    def _on_word_boundaries(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            return False
+        return end == len(text) or not (text[end].isalnum() or text[end] == "_")
+
+    def _accepts(self, text: str, start: int, end: int, pattern: str) -> bool:
+        if not self._on_word_boundaries(text, start, end):
+            return False
+        found = text[start:end]
+        return found[0].isupper() or found in self._spellings[pattern]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, tool name) matches in `text`."""
+        candidates = sorted(
+            (
+                (start, end, pattern)
+                for start, end, pattern in self._automaton.iter_matches(text)
+                if self._accepts(text, start, end, pattern)
+            ),
+            key=lambda match: (match[0], -(match[1] - match[0])),
+        )
+
+        matches = []
+        covered = 0
+        for start, end, pattern in candidates:
+            if start >= covered:
+                matches.append((start, end, self._names[pattern]))
+                covered = end
+        return matches
+
+    def names_in(self, text: str) -> Set[str]:
+        """Tools named in short free text such as a query, ignoring case."""
+        return {
+            self._names[pattern]
+            for start, end, pattern in self._automaton.iter_matches(text)
+            if self._on_word_boundaries(text, start, end)
+        }
+
+    def rank(self, documents: Iterable[str]) -> List[ToolMatch]:
+        """Tools found across `documents`, highest score first."""
+        ranked: Dict[str, ToolMatch] = {}
+        for document in documents:
+            seen = set()
+            for line in document.splitlines():
+                prominent_line = bool(_PROMINENT_LINE.match(line))
+                bold = [span.span() for span in _BOLD.finditer(line)]
+                for start, end, name in self.find(line):
+                    match = ranked.setdefault(
+                        name, ToolMatch(name, hint_only=name in self._hint_only)
+                    )
+                    match.mentions += 1
+                    match.prominent += prominent_line or any(
+                        bold_start <= start and end <= bold_end
+                        for bold_start, bold_end in bold
+                    )
+                    seen.add(name)
+            for name in seen:
+                ranked[name].articles += 1
+
+        return sorted(ranked.values(), key=lambda match: -match.score)
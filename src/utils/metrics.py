@@ -0,0 +1,176 @@
+"""Process-wide latency histograms and call counters with Prometheus export."""
+
+import functools
+import inspect
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Tuple
+
+from ..config.singleton import Singleton
+from .context import current_run
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+COUNTERS = ("calls", "errors", "fallbacks", "retries")
+# Recent observations kept per operation for exact quantiles
+QUANTILE_WINDOW = 500
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: Deque[float] = deque(maxlen=QUANTILE_WINDOW)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q: float) -> float:
+        """The `q` quantile of the last QUANTILE_WINDOW observations.
+
+        Bucket bounds are too coarse for this: a real p95 of 2.6s would
+        read as the 5s bucket.
+        """
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class Metrics(metaclass=Singleton):
+    """Registry of per-operation latency histograms and counters.
+
+    Operations are dotted names such as "node.research" or
+    "firecrawl.scrape". Counters track calls, errors, fallbacks and retries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Dict[str, int]] = {
+            name: defaultdict(int) for name in COUNTERS
+        }
+
+    def observe(self, operation: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                histogram = self._histograms[operation] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, counter: str, operation: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter][operation] += amount
+
+    def quantile(self, operation: str, q: float) -> float:
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            return histogram.quantile(q) if histogram else 0.0
+
+    def count(self, operation: str) -> int:
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            return histogram.count if histogram else 0
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            for counter in self._counters.values():
+                counter.clear()
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = [
+            "# HELP codescout_operation_duration_seconds Latency of workflow nodes and external calls.",
+            "# TYPE codescout_operation_duration_seconds histogram",
+        ]
+        with self._lock:
+            for operation in sorted(self._histograms):
+                histogram = self._histograms[operation]
+                label = f'operation="{operation}"'
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(
+                        f'codescout_operation_duration_seconds_bucket{{{label},le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'codescout_operation_duration_seconds_bucket{{{label},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(
+                    f"codescout_operation_duration_seconds_sum{{{label}}} {histogram.sum:.6f}"
+                )
+                lines.append(
+                    f"codescout_operation_duration_seconds_count{{{label}}} {histogram.count}"
+                )
+
+            for name in COUNTERS:
+                metric = f"codescout_operation_{name}_total"
+                lines.append(f"# HELP {metric} Operation {name} since process start.")
+                lines.append(f"# TYPE {metric} counter")
+                for operation in sorted(self._counters[name]):
+                    lines.append(
+                        f'{metric}{{operation="{operation}"}} {self._counters[name][operation]}'
+                    )
+
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def timed(operation: str) -> Iterator[None]:
+    """Time the enclosed block as one call of `operation`.
+
+    The duration lands in the process-wide histogram and, when a workflow
+    run is active, in that run's timing breakdown. Exceptions count as
+    errors and are re-raised.
+    """
+    metrics = Metrics()
+    metrics.increment("calls", operation)
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        metrics.increment("errors", operation)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe(operation, elapsed)
+        run = current_run()
+        if run:
+            run.timings.record(operation, elapsed, failed)
+
+
+def record_fallback(operation: str):
+    Metrics().increment("fallbacks", operation)
+
+
+def instrument(operation: str, fn: Callable) -> Callable:
+    """Wrap a sync or async callable so every call is `timed`."""
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with timed(operation):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with timed(operation):
+            return fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,87 @@
+"""Compact text encoding of researched tools for the recommendation prompt."""
+
+from typing import List
+
+from ..config.schemas import CompanyInfo
+
+# Labels for list fields, in the order they are written
+_LIST_FIELDS = (
+    ("tech_stack", "stack"),
+    ("language_support", "languages"),
+    ("integration_capabilities", "integrations"),
+    ("competitors", "competitors"),
+)
+_ELLIPSIS = "…"
+
+
+def _flag(value: bool) -> str:
+    return "yes" if value else "no"
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut `text` to at most `limit` characters, on a word boundary if possible."""
+    if len(text) <= limit:
+        return text
+    cut = text[: max(0, limit - len(_ELLIPSIS))]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    return cut.rstrip(" ,;|") + _ELLIPSIS
+
+
+def compact_company(company: CompanyInfo, budget: int = 0) -> str:
+    """One tool as dense key-value lines, omitting empty and unknown fields.
+
+        Supabase <https://supabase.com>
+        pricing: Freemium | open source: yes | api: yes
+        Open source Postgres platform with auth, storage and instant APIs.
+        stack: Postgres, REST, GraphQL
+
+    `budget` caps the encoding in characters (0 for no cap); lines are
+    dropped from the end, and the last one that fits partly is shortened.
+    """
+    header = company.name
+    if company.website:
+        header += f" <{company.website}>"
+
+    facts = []
+    if company.pricing_model and company.pricing_model.lower() != "unknown":
+        facts.append(f"pricing: {company.pricing_model}")
+    if company.is_open_source is not None:
+        facts.append(f"open source: {_flag(company.is_open_source)}")
+    if company.api_available is not None:
+        facts.append(f"api: {_flag(company.api_available)}")
+    if company.developer_experience_rating:
+        facts.append(f"dx: {company.developer_experience_rating}")
+
+    lines: List[str] = [header]
+    if facts:
+        lines.append(" | ".join(facts))
+    # The description often just repeats the name when analysis failed
+    description = " ".join(company.description.split())
+    if description and description.lower() != company.name.lower():
+        lines.append(description)
+    for field, label in _LIST_FIELDS:
+        values = [value for value in getattr(company, field) if value]
+        if values:
+            lines.append(f"{label}: {', '.join(values)}")
+
+    if budget <= 0:
+        return "\n".join(lines)
+
+    kept: List[str] = []
+    used = 0
+    for line in lines:
+        remaining = budget - used - (1 if kept else 0)
+        if len(line) > remaining:
+            # Keep a shortened line only if enough of it survives to be useful
+            if remaining > len(_ELLIPSIS) + 10 or not kept:
+                kept.append(_truncate(line, remaining))
+            break
+        kept.append(line)
+        used += len(line) + (1 if len(kept) > 1 else 0)
+    return "\n".join(kept)
+
+
+def compact_companies(companies: List[CompanyInfo], budget: int = 0) -> str:
+    """Every tool's `compact_company` encoding, separated by blank lines."""
+    return "\n\n".join(compact_company(company, budget) for company in companies)
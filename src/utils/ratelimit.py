@@ -0,0 +1,370 @@
+"""Client-side rate limiting, adaptive concurrency and retry for API providers."""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from ..config.logging import Logger
+from ..config.settings import get_settings
+from ..config.singleton import Singleton
+from .context import DeadlineExceeded, current_run
+from .metrics import Metrics, timed
+
+# Status codes worth retrying; only 429 also shrinks the concurrency limit
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Minimum seconds between two multiplicative decreases of the limit, so a
+# burst of 429s from requests already in flight only halves it once
+DECREASE_COOLDOWN = 1.0
+# Poll interval for async callers waiting on a concurrency slot
+ASYNC_POLL_INTERVAL = 0.02
+
+
+def _remaining() -> Optional[float]:
+    run = current_run()
+    return run.remaining() if run else None
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait, from the Retry-After header."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second.
+
+    `reserve` takes a token immediately, letting the balance go negative,
+    and returns how long the caller must wait before using it. Sync and
+    async callers then sleep in their own way outside the lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def available(self) -> float:
+        """Tokens that could be taken right now without waiting."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return 0.0
+            return min(self.burst, self._tokens + (now - self._updated) * self.rate)
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds`, e.g. after a Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests.
+
+    Each success raises the limit by roughly one per limit's worth of
+    requests; a rate-limit error halves it. The limit stays within
+    [1, `max_limit`].
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < max(1, int(self.limit)):
+            self.in_flight += 1
+            return True
+        return False
+
+    def has_slot(self) -> bool:
+        with self._condition:
+            return self.in_flight < max(1, int(self.limit))
+
+    def acquire(self):
+        with self._condition:
+            while not self._try_acquire():
+                self._condition.wait()
+
+    async def aacquire(self):
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    return
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self):
+        with self._condition:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify()
+
+    def on_rate_limited(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_COOLDOWN:
+                self.limit = max(1.0, self.limit / 2)
+                self._last_decrease = now
+
+
+class RateLimiter:
+    """Rate limit, concurrency limit and retry policy for one provider.
+
+    Every attempt waits for a bucket token and a concurrency slot, and is
+    `timed` under the caller's operation name. Retryable failures back off
+    exponentially with full jitter, or for as long as Retry-After asks,
+    and count towards the "retries" metric. The last error is re-raised
+    once attempts run out, or as soon as a backoff would outlast the
+    current run's deadline; a queue wait that would do so raises
+    `DeadlineExceeded` instead.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        burst: int,
+        max_concurrency: int,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        """
+        Initialize the limiter.
+        Args:
+            name: Provider name used in log messages.
+            requests_per_minute: Sustained request rate allowed.
+            burst: Requests that may be sent back to back after idling.
+            max_concurrency: Upper bound of the adaptive in-flight limit.
+            max_retries: Retries after the first attempt; 0 disables retrying.
+            base_delay: Backoff ceiling for the first retry, in seconds.
+            max_delay: Cap on any single backoff, in seconds.
+        """
+        self.name = name
+        self.logger = Logger().get_logger(name=self.__class__.__name__)
+        self.bucket = TokenBucket(requests_per_minute / 60, burst)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def has_capacity(self) -> bool:
+        """True if a request sent now would go out without queueing."""
+        return self.concurrency.has_slot() and self.bucket.available() >= 1
+
+    def _backoff(self, operation: str, attempt: int, error: Exception) -> Optional[float]:
+        """Seconds to wait before retrying `error`, or None to give up."""
+        status = _status_code(error)
+        if status not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+            return None
+
+        retry_after = _retry_after(error)
+        if status == 429:
+            self.concurrency.on_rate_limited()
+            if retry_after:
+                self.bucket.pause(retry_after)
+
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        remaining = _remaining()
+        if remaining is not None and delay >= remaining:
+            self.logger.warning(
+                "⏰ %s returned %s for %s, not retrying past the query deadline",
+                self.name,
+                status,
+                operation,
+            )
+            return None
+
+        Metrics().increment("retries", operation)
+        self.logger.warning(
+            "⏳ %s returned %s for %s, retrying in %.1fs "
+            "(attempt %d/%d, concurrency limit %d)",
+            self.name,
+            status,
+            operation,
+            delay,
+            attempt + 2,
+            self.max_retries + 1,
+            self.concurrency.limit,
+        )
+        return delay
+
+    def _queue_wait(self, operation: str) -> float:
+        """Seconds to wait for a bucket token, within the run's deadline."""
+        wait = self.bucket.reserve()
+        remaining = _remaining()
+        if remaining is not None and wait > remaining:
+            raise DeadlineExceeded(
+                f"{operation} would wait {wait:.1f}s for {self.name}, past the query deadline"
+            )
+        return wait
+
+    def call(self, operation: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            time.sleep(self._queue_wait(operation))
+            self.concurrency.acquire()
+            try:
+                with timed(operation):
+                    result = fn(*args, **kwargs)
+                self.concurrency.on_success()
+                return result
+            except Exception as e:
+                delay = self._backoff(operation, attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                self.concurrency.release()
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, operation: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Async counterpart of `call`; `fn` must return an awaitable."""
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._queue_wait(operation))
+            await self.concurrency.aacquire()
+            try:
+                with timed(operation):
+                    result = await fn(*args, **kwargs)
+                self.concurrency.on_success()
+                return result
+            except Exception as e:
+                delay = self._backoff(operation, attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                self.concurrency.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stream(
+        self, operation: str, fn: Callable[..., Iterator[Any]], *args, **kwargs
+    ) -> Iterator[Any]:
+        """Like `call` for a streaming `fn`, holding a slot until it is drained.
+
+        Only failures before the first item are retried, since items
+        already yielded cannot be taken back.
+        """
+        attempt = 0
+        while True:
+            time.sleep(self._queue_wait(operation))
+            self.concurrency.acquire()
+            started = False
+            try:
+                with timed(operation):
+                    for item in fn(*args, **kwargs):
+                        started = True
+                        yield item
+                self.concurrency.on_success()
+                return
+            except Exception as e:
+                delay = None if started else self._backoff(operation, attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                self.concurrency.release()
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def astream(
+        self, operation: str, fn: Callable[..., AsyncIterator[Any]], *args, **kwargs
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of `stream`; `fn` must return an async iterator."""
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._queue_wait(operation))
+            await self.concurrency.aacquire()
+            started = False
+            try:
+                with timed(operation):
+                    async for item in fn(*args, **kwargs):
+                        started = True
+                        yield item
+                self.concurrency.on_success()
+                return
+            except Exception as e:
+                delay = None if started else self._backoff(operation, attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                self.concurrency.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class RateLimiters(metaclass=Singleton):
+    """Process-wide limiters, one per provider, sized from `Settings`."""
+
+    def __init__(self):
+        settings = get_settings()
+        retry = dict(
+            max_retries=settings.MAX_RETRIES,
+            base_delay=settings.RETRY_BASE_DELAY,
+            max_delay=settings.RETRY_MAX_DELAY,
+        )
+        self._limiters: Dict[str, RateLimiter] = {
+            "groq": RateLimiter(
+                "groq",
+                settings.GROQ_REQUESTS_PER_MINUTE,
+                settings.GROQ_BURST,
+                settings.GROQ_MAX_CONCURRENCY,
+                **retry,
+            ),
+            "firecrawl": RateLimiter(
+                "firecrawl",
+                settings.FIRECRAWL_REQUESTS_PER_MINUTE,
+                settings.FIRECRAWL_BURST,
+                settings.FIRECRAWL_MAX_CONCURRENCY,
+                **retry,
+            ),
+        }
+
+    def get(self, provider: str) -> RateLimiter:
+        return self._limiters[provider]
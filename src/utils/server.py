@@ -0,0 +1,188 @@
+"""HTTP service exposing the research workflow."""
+
+import json
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, TypeVar
+from urllib.parse import parse_qs, urlsplit
+
+from ..config.logging import Logger
+from ..config.settings import get_settings
+from .metrics import Metrics
+from .workflow import Workflow
+
+T = TypeVar("T")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class RequestCoalescer:
+    """Collapse concurrent calls that share a key into a single execution.
+
+    The first caller for a key runs the work; callers arriving while it is
+    in flight block on the same future and receive its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def run(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+class ResearchServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding one warm `Workflow` for all requests."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, workflow: Optional[Workflow] = None):
+        self.logger = Logger().get_logger(name=self.__class__.__name__)
+        self.workflow = workflow or Workflow()
+        self.coalescer = RequestCoalescer()
+        super().__init__((host, port), ResearchRequestHandler)
+
+    def research(self, query: str):
+        query = query.strip()
+        return self.coalescer.run(
+            normalize_query(query), lambda: self.workflow.run(query)
+        )
+
+
+class ResearchRequestHandler(BaseHTTPRequestHandler):
+    server: ResearchServer
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif parts.path == "/metrics":
+            self._send_metrics()
+        elif parts.path in ("/research", "/research/stream"):
+            query = parse_qs(parts.query).get("query", [""])[0]
+            self._handle_research(query, stream=parts.path == "/research/stream")
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path not in ("/research", "/research/stream"):
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Request body must be JSON"})
+            return
+
+        query = payload.get("query", "") if isinstance(payload, dict) else ""
+        self._handle_research(query, stream=path == "/research/stream")
+
+    def _handle_research(self, query: str, stream: bool = False):
+        if not isinstance(query, str) or not query.strip():
+            self._send_json(400, {"error": "Missing 'query'"})
+            return
+
+        if stream:
+            self._stream_research(query.strip())
+            return
+
+        try:
+            result = self.server.research(query)
+        except Exception as e:
+            self.server.logger.exception("Research failed for query '%s': %s", query, e)
+            self._send_json(500, {"error": "Research failed"})
+            return
+
+        self._send_json(200, result.model_dump(mode="json"))
+
+    def _stream_research(self, query: str):
+        """Write one JSON line per `WorkflowEvent` as the run progresses.
+
+        Streaming runs are not coalesced, since each client consumes its
+        own event sequence.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        try:
+            for event in self.server.workflow.stream(query):
+                line = event.model_dump_json(exclude_none=True) + "\n"
+                self.wfile.write(line.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.logger.warning(
+                "Client disconnected while streaming '%s'", query
+            )
+        except Exception as e:
+            self.server.logger.exception("Research failed for query '%s': %s", query, e)
+            self.wfile.write(b'{"type": "error", "error": "Research failed"}\n')
+
+    def _send_metrics(self):
+        body = Metrics().render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        self.server.logger.info("%s - " + format, self.address_string(), *args)
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None):
+    """Run the research HTTP service until interrupted."""
+    settings = get_settings()
+    server = ResearchServer(host or settings.HOST, port or settings.PORT)
+    # A long-running service pays the deferred imports and graph build
+    # up front rather than on its first request
+    server.workflow.workflow
+    server.logger.info(
+        "🚀 Serving research API on http://%s:%s",
+        server.server_address[0],
+        server.server_address[1],
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
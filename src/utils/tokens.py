@@ -0,0 +1,157 @@
+"""Token accounting and prompt budgets for LLM calls."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ..config.schemas import StageTokenUsage
+from ..config.settings import get_settings
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessage, BaseMessage
+
+# Rough chars-per-token ratio for English prose and markdown on Llama tokenizers
+CHARS_PER_TOKEN = 4
+# Chat template overhead per message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised before sending a prompt that would overrun a token budget."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of `text` without a tokenizer."""
+    if not text:
+        return 0
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def estimate_prompt_tokens(messages: List[BaseMessage]) -> int:
+    return sum(
+        estimate_tokens(str(message.content)) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def usage_from_response(message: Optional[AIMessage]) -> Optional[Tuple[int, int]]:
+    """Read (prompt, completion) token counts reported by the provider."""
+    if message is None:
+        return None
+
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    token_usage = (getattr(message, "response_metadata", None) or {}).get(
+        "token_usage"
+    )
+    if token_usage:
+        return (
+            token_usage.get("prompt_tokens", 0),
+            token_usage.get("completion_tokens", 0),
+        )
+    return None
+
+
+class TokenTracker:
+    """Thread-safe per-run token ledger with per-stage and per-query budgets.
+
+    Callers `reserve` the estimated prompt size before sending a request,
+    which fails fast when a budget would be exceeded, then `record` the
+    actual usage (or `release` the reservation if the call failed).
+    """
+
+    def __init__(
+        self,
+        stage_budgets: Optional[Dict[str, Optional[int]]] = None,
+        query_budget: Optional[int] = None,
+    ):
+        self.stage_budgets = stage_budgets or {}
+        self.query_budget = query_budget
+
+        self._lock = threading.Lock()
+        self._usage: Dict[str, StageTokenUsage] = {}
+        self._reserved: Dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls) -> TokenTracker:
+        settings = get_settings()
+        return cls(
+            stage_budgets={
+                "extract_tools": settings.TOKEN_BUDGET_EXTRACT_TOOLS,
+                "research": settings.TOKEN_BUDGET_RESEARCH,
+                "analyze": settings.TOKEN_BUDGET_ANALYZE,
+            },
+            query_budget=settings.TOKEN_BUDGET_PER_QUERY,
+        )
+
+    def _spent(self, stage: Optional[str] = None) -> int:
+        stages = [stage] if stage else set(self._usage) | set(self._reserved)
+        total = 0
+        for name in stages:
+            usage = self._usage.get(name)
+            if usage:
+                total += usage.prompt_tokens + usage.completion_tokens
+            total += self._reserved.get(name, 0)
+        return total
+
+    def reserve(self, stage: str, estimate: int):
+        """Reserve `estimate` prompt tokens for `stage`, enforcing budgets."""
+        with self._lock:
+            stage_budget = self.stage_budgets.get(stage)
+            if stage_budget is not None and self._spent(stage) + estimate > stage_budget:
+                raise TokenBudgetExceeded(
+                    f"Stage '{stage}' budget of {stage_budget} tokens exceeded "
+                    f"({self._spent(stage)} used, ~{estimate} requested)"
+                )
+            if self.query_budget is not None and self._spent() + estimate > self.query_budget:
+                raise TokenBudgetExceeded(
+                    f"Query budget of {self.query_budget} tokens exceeded "
+                    f"({self._spent()} used, ~{estimate} requested)"
+                )
+            self._reserved[stage] = self._reserved.get(stage, 0) + estimate
+
+    def release(self, stage: str, estimate: int):
+        with self._lock:
+            self._reserved[stage] = max(0, self._reserved.get(stage, 0) - estimate)
+
+    def record(
+        self,
+        stage: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        reserved: int = 0,
+        estimated: bool = False,
+    ):
+        """Record actual usage for one call, replacing its reservation."""
+        with self._lock:
+            self._reserved[stage] = max(0, self._reserved.get(stage, 0) - reserved)
+            usage = self._usage.setdefault(stage, StageTokenUsage())
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.calls += 1
+            if estimated:
+                usage.estimated_calls += 1
+
+    def record_cache_hit(self, stage: str):
+        with self._lock:
+            self._usage.setdefault(stage, StageTokenUsage()).cache_hits += 1
+
+    def report(self) -> Dict[str, StageTokenUsage]:
+        """Per-stage usage plus a "total" entry summing every stage."""
+        with self._lock:
+            report = {
+                stage: usage.model_copy() for stage, usage in self._usage.items()
+            }
+
+        total = StageTokenUsage()
+        for usage in report.values():
+            total.prompt_tokens += usage.prompt_tokens
+            total.completion_tokens += usage.completion_tokens
+            total.calls += usage.calls
+            total.cache_hits += usage.cache_hits
+            total.estimated_calls += usage.estimated_calls
+        report["total"] = total
+        return report
@@ -1,251 +1,1271 @@
-from typing import Dict, Any
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, SystemMessage
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import cached_property
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from ..config.logging import Logger
-from ..config.schemas import ResearchState, CompanyInfo, CompanyAnalysis
+from ..config.settings import get_settings
+from ..config.schemas import (
+    ResearchState,
+    CompanyInfo,
+    CompanyAnalysis,
+    BatchCompanyAnalysis,
+    PendingAnalysis,
+    ToolResearchState,
+    WorkflowEvent,
+)
 from ..config.prompts import DeveloperToolsPrompts
+from .canonical import ToolCanonicalizer, site_key
+from .content import (
+    ANALYSIS_KEYWORDS,
+    condense_markdown,
+    content_hash,
+    query_keywords,
+    strip_boilerplate,
+)
+from .context import (
+    DeadlineExceeded,
+    RunContext,
+    SiteClaims,
+    current_run,
+    run_context,
+)
 from .firecrawl import FirecrawlService
-from .llm import GroqLLM
+from .knowledge import ToolKnowledgeBase, tool_key
+from .llm import GroqLLM, MemoizedLLM
+from .matcher import KnownToolMatcher, ToolMatch
+from .metrics import instrument, record_fallback, timed
+from .payload import compact_companies
+from .tokens import TokenBudgetExceeded
+
+# langgraph and langchain take most of the startup time, so they are only
+# imported once a graph is built or a prompt is sent
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+    from langchain_core.runnables import RunnableLambda
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    from langgraph.graph.state import CompiledStateGraph
+
+# Most tools returned by the extraction stage
+MAX_EXTRACTED_TOOLS = 5
+# Queries asking for tools other than the ones they name
+_ALTERNATIVES_QUERY = re.compile(
+    r"\b(alternatives?|instead of|similar to|like|replacements? (?:for|of)"
+    r"|competitors?|other than|besides)\b",
+    re.IGNORECASE,
+)
+
+
+def _chat_messages(system: str, user: str) -> List[BaseMessage]:
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    return [SystemMessage(content=system), HumanMessage(content=user)]
 
 
 class Workflow:
-    def __init__(self):
+    def __init__(
+        self,
+        firecrawl: Optional[FirecrawlService] = None,
+        llm: Optional[MemoizedLLM] = None,
+    ):
+        """
+        Build the research workflow.
+        Args:
+            firecrawl: Search/scrape service; defaults to the live Firecrawl API.
+            llm: Chat model for every stage; defaults to Groq, with a
+                streaming client for recommendations.
+        """
+        self.settings = get_settings()
         self.logger = Logger().get_logger(name=self.__class__.__name__)
-        self.firecrawl = FirecrawlService()
-        self.llm = GroqLLM().get_llm()
         self.prompts = DeveloperToolsPrompts()
-        self.workflow = self._build_workflow()
 
-    def _build_workflow(self):
+        # Injected clients shadow the lazily built defaults below
+        if firecrawl is not None:
+            self.firecrawl = firecrawl
+        if llm is not None:
+            self.llm = llm
+            self.recommendation_llm = llm
+
+        self.knowledge: Optional[ToolKnowledgeBase] = None
+        if self.settings.KNOWLEDGE_BASE_ENABLED:
+            self.knowledge = ToolKnowledgeBase(
+                self.settings.KNOWLEDGE_BASE_PATH,
+                max_age=self.settings.KNOWLEDGE_MAX_AGE,
+            )
+
+    @cached_property
+    def firecrawl(self) -> FirecrawlService:
+        return FirecrawlService()
+
+    @cached_property
+    def llm(self) -> MemoizedLLM:
+        return GroqLLM().get_cached_llm()
+
+    @cached_property
+    def recommendation_llm(self) -> MemoizedLLM:
+        return GroqLLM().get_cached_llm(streaming=True)
+
+    @cached_property
+    def workflow(self) -> CompiledStateGraph:
+        """The compiled graph, built on first run."""
+        return self._build_workflow()
+
+    @cached_property
+    def checkpointer(self) -> Optional[SqliteSaver]:
+        if not self.settings.CHECKPOINT_ENABLED:
+            return None
+
+        import sqlite3
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        directory = os.path.dirname(self.settings.CHECKPOINT_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        checkpointer = SqliteSaver(
+            sqlite3.connect(self.settings.CHECKPOINT_PATH, check_same_thread=False)
+        )
+        self._prune_checkpoints(checkpointer)
+        return checkpointer
+
+    def _prune_checkpoints(self, checkpointer: SqliteSaver) -> int:
+        """Delete failed runs whose last checkpoint is older than CHECKPOINT_MAX_AGE.
+
+        Returns how many runs were deleted.
+        """
+        max_age = self.settings.CHECKPOINT_MAX_AGE
+        if max_age <= 0:
+            return 0
+
+        pruned = 0
+        try:
+            checkpointer.setup()
+            thread_ids = [
+                row[0]
+                for row in checkpointer.conn.execute(
+                    "SELECT DISTINCT thread_id FROM checkpoints"
+                )
+            ]
+            for thread_id in thread_ids:
+                latest = checkpointer.get_tuple({"configurable": {"thread_id": thread_id}})
+                if latest is None:
+                    continue
+                saved_at = datetime.fromisoformat(latest.checkpoint["ts"]).timestamp()
+                if time.time() - saved_at > max_age:
+                    checkpointer.delete_thread(thread_id)
+                    pruned += 1
+        except Exception as e:
+            # Stale checkpoints only waste disk; never fail a run over them
+            self.logger.warning("⚠️ Could not prune old checkpoints: %s", e)
+        if pruned:
+            self.logger.info(
+                "🧹 Pruned checkpoints of %d failed run(s) past CHECKPOINT_MAX_AGE",
+                pruned,
+            )
+        return pruned
+
+    @cached_property
+    def checkpointed_workflow(self) -> CompiledStateGraph:
+        """The compiled graph, saving a checkpoint after every step."""
+        if self.checkpointer is None:
+            return self.workflow
+        return self.workflow.copy(update={"checkpointer": self.checkpointer})
+
+    @asynccontextmanager
+    async def _acheckpointed_workflow(self) -> AsyncIterator[CompiledStateGraph]:
+        # The async saver is bound to the running event loop, so each async
+        # run opens its own connection
+        if not self.settings.CHECKPOINT_ENABLED:
+            yield self.workflow
+            return
+
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        if "checkpointer" not in self.__dict__:
+            # Prunes old runs once per workflow, off the event loop
+            await asyncio.to_thread(lambda: self.checkpointer)
+        directory = os.path.dirname(self.settings.CHECKPOINT_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(
+            self.settings.CHECKPOINT_PATH
+        ) as checkpointer:
+            yield self.workflow.copy(update={"checkpointer": checkpointer})
+
+    def _node(self, name: str, func, afunc) -> RunnableLambda:
+        """Wrap a step's sync and async implementations as a timed graph node."""
+        from langchain_core.runnables import RunnableLambda
+
+        return RunnableLambda(
+            instrument(f"node.{name}", func), afunc=instrument(f"node.{name}", afunc)
+        )
+
+    def _build_workflow(self) -> CompiledStateGraph:
+        from langgraph.graph import END, StateGraph
+
         graph = StateGraph(ResearchState)
-        graph.add_node("extract_tools", self._extract_tools_step)
-        graph.add_node("research", self._research_step)
-        graph.add_node("analyze", self._analyze_step)
+        graph.add_node(
+            "extract_tools",
+            self._node(
+                "extract_tools", self._extract_tools_step, self._aextract_tools_step
+            ),
+        )
+        graph.add_node(
+            "plan_research",
+            self._node(
+                "plan_research", self._plan_research_step, self._aplan_research_step
+            ),
+        )
+        graph.add_node(
+            "research",
+            self._node("research", self._research_step, self._aresearch_step),
+            input_schema=ToolResearchState,
+        )
+        graph.add_node(
+            "analyze", self._node("analyze", self._analyze_step, self._aanalyze_step)
+        )
         graph.set_entry_point("extract_tools")
-        graph.add_edge("extract_tools", "research")
-        graph.add_edge("research", "analyze")
+        graph.add_edge("extract_tools", "plan_research")
+        graph.add_conditional_edges(
+            "plan_research", self._dispatch_research, ["research", "analyze"]
+        )
+        if self.settings.ANALYSIS_BATCH_SIZE > 1:
+            graph.add_node(
+                "analyze_batch",
+                self._node(
+                    "analyze_batch",
+                    self._analyze_batch_step,
+                    self._aanalyze_batch_step,
+                ),
+            )
+            graph.add_edge("research", "analyze_batch")
+            graph.add_edge("analyze_batch", "analyze")
+        else:
+            graph.add_edge("research", "analyze")
         graph.add_edge("analyze", END)
         return graph.compile()
 
+    # Stage 1: tool extraction
+
     def _extract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
-        self.logger.info(f"🔍 Finding articles about: {state.query}")
+        self.logger.info("🔍 Finding articles about: %s", state.query)
+
+        search_results = self.firecrawl.search_companies(
+            self._article_query(state.query), num_results=3
+        )
+        urls = self._article_urls(search_results)
+        if urls is None:
+            return {"extracted_tools": []}
 
-        article_query = f"{state.query} tools comparison best alternatives"
-        search_results = self.firecrawl.search_companies(article_query, num_results=3)
+        scraped_pages = self.firecrawl.scrape_company_pages(urls)
+        matches = self._match_known_tools(state.query, scraped_pages)
+        matched_tools = self._matched_tool_names(state.query, matches)
+        if matched_tools:
+            return {"extracted_tools": matched_tools}
+        messages = self._extraction_messages(state.query, scraped_pages, matches)
+
+        try:
+            if self.settings.PIPELINED_EXTRACTION:
+                return {"extracted_tools": self._stream_tool_names(messages)}
+            response = self.llm.invoke(messages, stage="extract_tools")
+            return {"extracted_tools": self._parse_tool_names(response.content)}
+        except Exception as e:
+            self.logger.exception("Error extracting tools: %s", e)
+            return {"extracted_tools": []}
 
+    async def _aextract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
+        self.logger.info("🔍 Finding articles about: %s", state.query)
+
+        search_results = await self.firecrawl.asearch_companies(
+            self._article_query(state.query), num_results=3
+        )
+        urls = self._article_urls(search_results)
+        if urls is None:
+            return {"extracted_tools": []}
+
+        scraped_pages = await self.firecrawl.ascrape_company_pages(urls)
+        matches = self._match_known_tools(state.query, scraped_pages)
+        matched_tools = self._matched_tool_names(state.query, matches)
+        if matched_tools:
+            return {"extracted_tools": matched_tools}
+        messages = self._extraction_messages(state.query, scraped_pages, matches)
+
+        try:
+            if self.settings.PIPELINED_EXTRACTION:
+                return {"extracted_tools": await self._astream_tool_names(messages)}
+            response = await self.llm.ainvoke(messages, stage="extract_tools")
+            return {"extracted_tools": self._parse_tool_names(response.content)}
+        except Exception as e:
+            self.logger.exception("Error extracting tools: %s", e)
+            return {"extracted_tools": []}
+
+    def _article_query(self, query: str) -> str:
+        return f"{query} tools comparison best alternatives"
+
+    def _article_urls(self, search_results) -> Optional[List[str]]:
         if not search_results or isinstance(search_results, list):
             self.logger.warning("No search results found")
-            return {"extracted_tools": []}
+            return None
 
         results = search_results.web if hasattr(search_results, "web") else []
+        return [result.url if hasattr(result, "url") else "" for result in results]
+
+    def _match_known_tools(self, query: str, scraped_pages) -> List[ToolMatch]:
+        """Dictionary tools featured in the articles.
+
+        Tools named in the query come first, or are left out entirely when
+        the query asks for alternatives to them.
+        """
+        if not self.settings.TOOL_MATCHER_ENABLED:
+            return []
+
+        matcher = KnownToolMatcher()
+        with timed("extract_tools.match"):
+            matches = matcher.rank(
+                strip_boilerplate(scraped.markdown)
+                for scraped in scraped_pages
+                if scraped and scraped.markdown
+            )
+        named = matcher.names_in(query)
+        if _ALTERNATIVES_QUERY.search(query):
+            # "X alternatives" asks for everything but X
+            return [match for match in matches if match.name not in named]
+        return sorted(matches, key=lambda match: match.name not in named)
+
+    def _matched_tool_names(self, query: str, matches: List[ToolMatch]) -> List[str]:
+        """Tool names to use without an LLM call, or [] if the match is too thin."""
+        confident = [match.name for match in matches if match.confident]
+        if len(confident) < self.settings.TOOL_MATCH_MIN_CONFIDENT:
+            return []
 
+        tool_names = confident[:MAX_EXTRACTED_TOOLS]
+        if not _ALTERNATIVES_QUERY.search(query):
+            # "X vs Y" must research X and Y, so leave it to the LLM unless
+            # the articles feature both
+            if not KnownToolMatcher().names_in(query).issubset(tool_names):
+                return []
+        self.logger.info("⚡ Matched known tools: %s", ", ".join(tool_names))
+        return tool_names
+
+
+    def _extraction_messages(
+        self, query: str, scraped_pages, matches: Optional[List[ToolMatch]] = None
+    ) -> List[BaseMessage]:
+        keywords = query_keywords(query, "tools alternatives comparison best")
         all_content = ""
-        for result in results:
-            url = result.url if hasattr(result, "url") else ""
-            scraped = self.firecrawl.scrape_company_page(url)
-            if scraped:
-                all_content += scraped.markdown[:1500] + "\n\n"
-
-        messages = [
-            SystemMessage(content=self.prompts.TOOL_EXTRACTION_SYSTEM),
-            HumanMessage(
-                content=self.prompts.tool_extraction_user(state.query, all_content)
-            ),
+        for scraped in scraped_pages:
+            if scraped and scraped.markdown:
+                all_content += (
+                    condense_markdown(
+                        scraped.markdown,
+                        self.settings.ARTICLE_CONTENT_BUDGET,
+                        keywords,
+                    )
+                    + "\n\n"
+                )
+
+        hints = [match.name for match in (matches or [])]
+        hints = hints[: self.settings.TOOL_MATCH_MAX_HINTS]
+        return _chat_messages(
+            self.prompts.TOOL_EXTRACTION_SYSTEM,
+            self.prompts.tool_extraction_user(query, all_content, hints),
+        )
+
+    def _parse_tool_names(self, raw_response: str) -> List[str]:
+        tool_names = []
+        for line in raw_response.strip().split("\n"):
+            cleaned = self._tool_name_from_line(line)
+            if cleaned:
+                tool_names.append(cleaned)
+
+        tool_names = tool_names[:MAX_EXTRACTED_TOOLS]
+
+        self.logger.info("Extracted tools: %s", ", ".join(tool_names))
+        return tool_names
+
+    def _tool_name_from_line(self, line: str) -> Optional[str]:
+        line = line.strip()
+        if not line or any(
+            [
+                line.lower().startswith("based on"),
+                line.lower().startswith("here"),
+                line.lower().startswith("the following"),
+                line.lower().startswith("i extracted"),
+                line.endswith(":"),
+                len(line) > 50,
+            ]
+        ):
+            return None
+        return line.lstrip("0123456789.-*• ") or None
+
+    # Pipelined extraction (PIPELINED_EXTRACTION): research content for each
+    # tool is gathered as soon as its line of the extraction stream completes
+
+    @cached_property
+    def _prefetch_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=max(1, self.settings.RESEARCH_MAX_CONCURRENCY),
+            thread_name_prefix="prefetch",
+        )
+
+    def _stream_tool_names(self, messages: List[BaseMessage]) -> List[str]:
+        tool_names: List[str] = []
+        pending = ""
+        for text in self.llm.stream(messages, stage="extract_tools"):
+            *lines, pending = (pending + text).split("\n")
+            for line in lines:
+                self._take_streamed_line(line, tool_names)
+        self._take_streamed_line(pending, tool_names)
+
+        self.logger.info("Extracted tools: %s", ", ".join(tool_names))
+        return tool_names
+
+    async def _astream_tool_names(self, messages: List[BaseMessage]) -> List[str]:
+        tool_names: List[str] = []
+        pending = ""
+        async for text in self.llm.astream(messages, stage="extract_tools"):
+            *lines, pending = (pending + text).split("\n")
+            for line in lines:
+                self._take_streamed_line(line, tool_names, asynchronous=True)
+        self._take_streamed_line(pending, tool_names, asynchronous=True)
+
+        self.logger.info("Extracted tools: %s", ", ".join(tool_names))
+        return tool_names
+
+    def _take_streamed_line(
+        self, line: str, tool_names: List[str], asynchronous: bool = False
+    ):
+        """Record the tool named on `line` and start gathering its content."""
+        tool_name = self._tool_name_from_line(line)
+        if not tool_name or len(tool_names) >= MAX_EXTRACTED_TOOLS:
+            return
+        tool_names.append(tool_name)
+
+        run = current_run()
+        # Named like the research targets `_research_targets` will produce,
+        # and keyed so that spellings such as "Acme DB" and "AcmeDB" share
+        # one prefetch
+        target = ToolCanonicalizer().canonical(tool_name)
+        key = tool_key(target)
+        if (
+            run is None
+            or key in run.prefetched
+            or len(run.prefetched) >= self.settings.RESEARCH_MAX_TOOLS
+            or (self.knowledge and self.knowledge.is_fresh(target))
+        ):
+            return
+
+        self.logger.info("⚡ Researching %s while extraction continues", target)
+        if asynchronous:
+            run.prefetched[key] = asyncio.create_task(
+                self._agather_tool_content(target)
+            )
+        else:
+            context = contextvars.copy_context()
+            run.prefetched[key] = self._prefetch_pool.submit(
+                context.run, self._gather_tool_content, target
+            )
+
+    def _research_content(self, tool_name: str) -> Optional[Tuple[CompanyInfo, str]]:
+        """Content gathered for `tool_name`, reusing a pipelined prefetch."""
+        run = current_run()
+        prefetched = run.prefetched.pop(tool_key(tool_name), None) if run else None
+        if prefetched is not None:
+            return prefetched.result()
+        return self._gather_tool_content(tool_name)
+
+    async def _aresearch_content(
+        self, tool_name: str
+    ) -> Optional[Tuple[CompanyInfo, str]]:
+        run = current_run()
+        prefetched = run.prefetched.pop(tool_key(tool_name), None) if run else None
+        if prefetched is not None:
+            return await prefetched
+        return await self._agather_tool_content(tool_name)
+
+    # Stage 2: per-tool research
+
+    def _plan_research_step(self, state: ResearchState) -> Dict[str, Any]:
+        if state.extracted_tools:
+            return self._research_targets(state.extracted_tools)
+
+        self.logger.warning("⚠️ No extracted tools found, falling back to direct search")
+        record_fallback("plan_research.direct_search")
+        search_results = self.firecrawl.search_companies(
+            state.query, num_results=self.settings.RESEARCH_MAX_TOOLS
+        )
+        return self._research_targets(self._fallback_tool_names(search_results))
+
+    async def _aplan_research_step(self, state: ResearchState) -> Dict[str, Any]:
+        if state.extracted_tools:
+            return self._research_targets(state.extracted_tools)
+
+        self.logger.warning("⚠️ No extracted tools found, falling back to direct search")
+        record_fallback("plan_research.direct_search")
+        search_results = await self.firecrawl.asearch_companies(
+            state.query, num_results=self.settings.RESEARCH_MAX_TOOLS
+        )
+        return self._research_targets(self._fallback_tool_names(search_results))
+
+    def _fallback_tool_names(self, search_results) -> List[str]:
+        if not search_results or isinstance(search_results, list):
+            self.logger.error("No search results in fallback")
+            return []
+
+        results = search_results.web if hasattr(search_results, "web") else []
+        return [
+            result.title if hasattr(result, "title") else "Unknown"
+            for result in results
         ]
 
-        try:
-            response = self.llm.invoke(messages)
-
-            raw_response = response.content.strip()
-
-            tool_names = []
-            for line in raw_response.split("\n"):
-                line = line.strip()
-                if line and not any(
-                    [
-                        line.lower().startswith("based on"),
-                        line.lower().startswith("here"),
-                        line.lower().startswith("the following"),
-                        line.lower().startswith("i extracted"),
-                        line.endswith(":"),
-                        len(line) > 50,
-                    ]
-                ):
-                    cleaned = line.lstrip("0123456789.-*• ")
-                    if cleaned:
-                        tool_names.append(cleaned)
-
-            tool_names = tool_names[:5]
-
-            print(f"Extracted tools: {', '.join(tool_names)}")
-            return {"extracted_tools": tool_names}
-        except Exception as e:
-            self.logger.exception(f"Error extracting tools: {e}")
-            return {"extracted_tools": []}
+    def _research_targets(self, tool_names: List[str]) -> Dict[str, Any]:
+        tool_names, duplicates = ToolCanonicalizer().dedupe(tool_names)
+        for duplicate, survivor in duplicates.items():
+            self.logger.info("🔁 '%s' is %s, researching it once", duplicate, survivor)
+        tool_names = tool_names[: self.settings.RESEARCH_MAX_TOOLS]
+        if tool_names:
+            self.logger.info("🔬 Researching specific tools: %s", ", ".join(tool_names))
+        return {"research_targets": tool_names}
 
-    def _analyze_company_content(
-        self, company_name: str, content: str
-    ) -> CompanyAnalysis:
-        structured_llm = self.llm.with_structured_output(CompanyAnalysis)
+    def _dispatch_research(self, state: ResearchState) -> Union[list, str]:
+        """`Send` one research task per target, or go straight to "analyze"."""
+        # LangGraph resolves this method's type hints while building the
+        # graph, so `Send` (imported lazily) stays out of the signature
+        from langgraph.types import Send
 
-        messages = [
-            SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
-            HumanMessage(
-                content=self.prompts.tool_analysis_user(company_name, content)
-            ),
+        if not state.research_targets:
+            return "analyze"
+
+        return [
+            Send("research", ToolResearchState(query=state.query, tool_name=name))
+            for name in state.research_targets
         ]
 
-        try:
-            analysis = structured_llm.invoke(messages)
-            return analysis
-        except Exception as e:
-            self.logger.exception(f"Error analyzing company: {e}")
-            return CompanyAnalysis(
-                pricing_model="Unknown",
-                is_open_source=None,
-                tech_stack=[],
-                description="Failed",
-                api_available=None,
-                language_support=[],
-                integration_capabilities=[],
+    def _research_step(self, task: ToolResearchState) -> Dict[str, Any]:
+        known = self._known_company(task.tool_name)
+        if known:
+            if self._site_taken(known.name, known.website):
+                return {"companies": []}
+            return {"companies": [known]}
+        if self._deadline_passed(f"research of {task.tool_name}"):
+            return {"companies": []}
+
+        if self.settings.ANALYSIS_BATCH_SIZE > 1:
+            return self._pending_update(self._research_content(task.tool_name))
+
+        company = self._research_tool(task.tool_name)
+        return {"companies": [company] if company else []}
+
+    async def _aresearch_step(self, task: ToolResearchState) -> Dict[str, Any]:
+        known = self._known_company(task.tool_name)
+        if known:
+            if self._site_taken(known.name, known.website):
+                return {"companies": []}
+            return {"companies": [known]}
+        if self._deadline_passed(f"research of {task.tool_name}"):
+            return {"companies": []}
+
+        if self.settings.ANALYSIS_BATCH_SIZE > 1:
+            return self._pending_update(
+                await self._aresearch_content(task.tool_name)
             )
 
-    def _research_step(self, state: ResearchState) -> Dict[str, Any]:
-        extracted_tools = getattr(state, "extracted_tools", [])
+        company = await self._aresearch_tool(task.tool_name)
+        return {"companies": [company] if company else []}
+
+    def _known_company(self, tool_name: str) -> Optional[CompanyInfo]:
+        if not self.knowledge:
+            return None
+
+        company = self.knowledge.get(tool_name)
+        if company:
+            self.logger.info("📚 Reusing stored research for %s", tool_name)
+        return company
+
+    def _deadline_passed(self, skipped: str) -> bool:
+        """True once the run's QUERY_DEADLINE has passed, logging what is skipped."""
+        run = current_run()
+        if run is None or not run.expired():
+            return False
 
-        if not extracted_tools:
-            self.logger.warning(
-                "⚠️ No extracted tools found, falling back to direct search"
+        record_fallback("workflow.deadline")
+        self.logger.warning("⏰ Query deadline reached, skipping %s", skipped)
+        return True
+
+    def _site_taken(self, tool_name: str, url: str) -> bool:
+        """Claim the tool's site for this run; True if another tool already has it.
+
+        Different names can resolve to the same official page ("Supabase"
+        and "Supabase.io"), which only needs scraping and analyzing once.
+        """
+        run = current_run()
+        site = site_key(url) if url else ""
+        if run is None or not site:
+            return False
+
+        owner = run.sites.claim(site, tool_name)
+        if owner:
+            self.logger.info(
+                "🔁 %s resolves to %s, already researched as %s", tool_name, site, owner
             )
-            search_results = self.firecrawl.search_companies(state.query, num_results=4)
+        return owner is not None
 
-            if not search_results or isinstance(search_results, list):
-                self.logger.error("No search results in fallback")
-                return {"companies": []}
+    def _stored_analysis(
+        self, company: CompanyInfo, content: str
+    ) -> Optional[CompanyAnalysis]:
+        if not self.knowledge:
+            return None
 
-            results = search_results.web if hasattr(search_results, "web") else []
-            tool_names = [
-                result.title if hasattr(result, "title") else "Unknown"
-                for result in results
-            ]
+        analysis = self.knowledge.page_analysis(company.website, content_hash(content))
+        if analysis:
+            self.logger.info("♻️ %s page unchanged, reusing its analysis", company.name)
+        return analysis
+
+    def _remember(self, company: CompanyInfo, analysis: CompanyAnalysis, content: str):
+        # Failed analyses are not stored, so the tool is retried next time
+        if self.knowledge and not self._is_failed_analysis(analysis):
+            self.knowledge.put(company)
+            self.knowledge.put_page_analysis(
+                company.website, content_hash(content), analysis
+            )
+
+    def _pending_update(
+        self, gathered: Optional[Tuple[CompanyInfo, str]]
+    ) -> Dict[str, Any]:
+        if not gathered:
+            return {"pending_analyses": []}
+
+        company, content = gathered
+        analysis = self._stored_analysis(company, content)
+        if analysis:
+            return {"companies": [self._analyzed_copy(company, analysis, content)]}
+        return {"pending_analyses": [PendingAnalysis(company=company, content=content)]}
+
+    def _research_tool(self, tool_name: str) -> Optional[CompanyInfo]:
+        gathered = self._research_content(tool_name)
+        if not gathered:
+            return None
+        company, content = gathered
+
+        analysis = self._stored_analysis(company, content)
+        if analysis is None:
+            # Past the deadline, return the tool as found by search
+            if self._deadline_passed(f"analysis of {tool_name}"):
+                return company
+            self.logger.info("🧠 Analyzing %s", tool_name)
+            analysis = self._analyze_company_content(company.name, content)
+        self._apply_analysis(company, analysis)
+        self._remember(company, analysis, content)
+
+        self.logger.info("✅ Successfully researched %s", tool_name)
+        return company
+
+    async def _aresearch_tool(self, tool_name: str) -> Optional[CompanyInfo]:
+        gathered = await self._aresearch_content(tool_name)
+        if not gathered:
+            return None
+        company, content = gathered
+
+        analysis = self._stored_analysis(company, content)
+        if analysis is None:
+            # Past the deadline, return the tool as found by search
+            if self._deadline_passed(f"analysis of {tool_name}"):
+                return company
+            self.logger.info("🧠 Analyzing %s", tool_name)
+            analysis = await self._aanalyze_company_content(company.name, content)
+        self._apply_analysis(company, analysis)
+        self._remember(company, analysis, content)
+
+        self.logger.info("✅ Successfully researched %s", tool_name)
+        return company
+
+    def _gather_tool_content(
+        self, tool_name: str
+    ) -> Optional[Tuple[CompanyInfo, str]]:
+        self.logger.info("📍 Researching: %s", tool_name)
+
+        tool_search_results = self.firecrawl.search_companies(
+            tool_name + " official site", num_results=1
+        )
+        found = self._company_from_search(tool_name, tool_search_results)
+        if not found:
+            return None
+        company, search_markdown = found
+        if self._site_taken(tool_name, company.website):
+            return None
+
+        self.logger.info("🔎 Attempting to scrape %s", company.website)
+        scraped = self.firecrawl.scrape_company_page(
+            company.website, has_fallback=bool(search_markdown)
+        )
+
+        content = self._select_content(tool_name, scraped, search_markdown)
+        return (company, content) if content else None
+
+    async def _agather_tool_content(
+        self, tool_name: str
+    ) -> Optional[Tuple[CompanyInfo, str]]:
+        self.logger.info("📍 Researching: %s", tool_name)
+
+        tool_search_results = await self.firecrawl.asearch_companies(
+            tool_name + " official site", num_results=1
+        )
+        found = self._company_from_search(tool_name, tool_search_results)
+        if not found:
+            return None
+        company, search_markdown = found
+        if self._site_taken(tool_name, company.website):
+            return None
+
+        self.logger.info("🔎 Attempting to scrape %s", company.website)
+        scraped = await self.firecrawl.ascrape_company_page(
+            company.website, has_fallback=bool(search_markdown)
+        )
+
+        content = self._select_content(tool_name, scraped, search_markdown)
+        return (company, content) if content else None
+
+    def _company_from_search(
+        self, tool_name: str, tool_search_results
+    ) -> Optional[Tuple[CompanyInfo, str]]:
+        if not tool_search_results or isinstance(tool_search_results, list):
+            self.logger.warning("⚠️ No search results for %s", tool_name)
+            return None
+
+        results = tool_search_results.web if hasattr(tool_search_results, "web") else []
+
+        self.logger.debug("Found %d results for %s", len(results), tool_name)
+
+        if not results:
+            return None
+
+        result = results[0]
+        url = result.url if hasattr(result, "url") else ""
+
+        search_markdown = result.markdown if hasattr(result, "markdown") else ""
+        self.logger.debug("Search markdown length: %d chars", len(search_markdown))
+
+        company = CompanyInfo(
+            name=tool_name,
+            description=search_markdown[:200] if search_markdown else "No description",
+            website=url,
+            tech_stack=[],
+            competitors=[],
+        )
+        return company, search_markdown
+
+    def _select_content(
+        self, tool_name: str, scraped, search_markdown: str
+    ) -> Optional[str]:
+        content = None
+        if scraped:
+            self.logger.debug("Scraped type: %s", type(scraped))
+            if hasattr(scraped, "markdown"):
+                content = scraped.markdown
+                self.logger.info("✅ Using scraped content (%d chars)", len(content))
+            else:
+                self.logger.warning("⚠️ Scraped object has no 'markdown' attribute")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Scraped object attributes: %s", dir(scraped))
         else:
-            tool_names = extracted_tools[:4]
+            self.logger.warning("⚠️ Scraping returned None")
 
-        self.logger.info(f"🔬 Researching specific tools: {', '.join(tool_names)}")
+        if not content and search_markdown:
+            content = search_markdown
+            record_fallback("research.search_markdown")
+            self.logger.info(
+                "🔄 Using search markdown as fallback (%d chars)", len(content)
+            )
 
-        companies = []
-        for tool_name in tool_names:
-            self.logger.info(f"📍 Researching: {tool_name}")
+        if not content:
+            self.logger.error("❌ No content available for %s, skipping", tool_name)
+            return None
 
-            tool_search_results = self.firecrawl.search_companies(
-                tool_name + " official site", num_results=1
+        return content
+
+    def _analyze_company_content(
+        self, company_name: str, content: str
+    ) -> CompanyAnalysis:
+        messages = self._analysis_messages(company_name, content)
+
+        try:
+            return self.llm.invoke_structured(
+                messages, CompanyAnalysis, stage="research"
             )
+        except Exception as e:
+            self.logger.exception("Error analyzing company: %s", e)
+            return self._failed_analysis()
 
-            if not tool_search_results or isinstance(tool_search_results, list):
-                self.logger.warning(f"⚠️ No search results for {tool_name}")
-                continue
+    async def _aanalyze_company_content(
+        self, company_name: str, content: str
+    ) -> CompanyAnalysis:
+        messages = self._analysis_messages(company_name, content)
 
-            results = (
-                tool_search_results.web if hasattr(tool_search_results, "web") else []
+        try:
+            return await self.llm.ainvoke_structured(
+                messages, CompanyAnalysis, stage="research"
             )
+        except Exception as e:
+            self.logger.exception("Error analyzing company: %s", e)
+            return self._failed_analysis()
 
-            self.logger.debug(f"Found {len(results)} results for {tool_name}")
+    def _analysis_messages(self, company_name: str, content: str) -> List[BaseMessage]:
+        return _chat_messages(
+            self.prompts.TOOL_ANALYSIS_SYSTEM,
+            self.prompts.tool_analysis_user(
+                company_name, self._condense_for_analysis(company_name, content)
+            ),
+        )
 
-            if results:
-                result = results[0]
-                url = result.url if hasattr(result, "url") else ""
+    def _condense_for_analysis(self, company_name: str, content: str) -> str:
+        return condense_markdown(
+            content,
+            self.settings.ANALYSIS_CONTENT_BUDGET,
+            ANALYSIS_KEYWORDS + tuple(query_keywords(company_name)),
+        )
 
-                search_markdown = result.markdown if hasattr(result, "markdown") else ""
-                self.logger.debug(
-                    f"Search markdown length: {len(search_markdown)} chars"
-                )
+    def _failed_analysis(self) -> CompanyAnalysis:
+        record_fallback("research.failed_analysis")
+        return CompanyAnalysis(
+            pricing_model="Unknown",
+            is_open_source=None,
+            tech_stack=[],
+            description="Failed",
+            api_available=None,
+            language_support=[],
+            integration_capabilities=[],
+        )
 
-                company = CompanyInfo(
-                    name=tool_name,
-                    description=search_markdown[:200]
-                    if search_markdown
-                    else "No description",
-                    website=url,
-                    tech_stack=[],
-                    competitors=[],
-                )
+    def _is_failed_analysis(self, analysis: CompanyAnalysis) -> bool:
+        return analysis.description == "Failed" and analysis.pricing_model == "Unknown"
+
+    def _apply_analysis(self, company: CompanyInfo, analysis: CompanyAnalysis):
+        company.pricing_model = analysis.pricing_model
+        company.is_open_source = analysis.is_open_source
+        company.tech_stack = analysis.tech_stack
+        company.description = analysis.description
+        company.api_available = analysis.api_available
+        company.language_support = analysis.language_support
+        company.integration_capabilities = analysis.integration_capabilities
 
-                self.logger.info(f"🔎 Attempting to scrape {url}")
-                scraped = self.firecrawl.scrape_company_page(url)
-
-                content = None
-                if scraped:
-                    self.logger.debug(f"Scraped type: {type(scraped)}")
-                    if hasattr(scraped, "markdown"):
-                        content = scraped.markdown
-                        self.logger.info(
-                            f"✅ Using scraped content ({len(content)} chars)"
-                        )
-                    else:
-                        self.logger.warning(
-                            f"⚠️ Scraped object has no 'markdown' attribute"
-                        )
-                        self.logger.debug(f"Scraped object attributes: {dir(scraped)}")
-                else:
-                    self.logger.warning(f"⚠️ Scraping returned None")
-
-                if not content and search_markdown:
-                    content = search_markdown
-                    self.logger.info(
-                        f"🔄 Using search markdown as fallback ({len(content)} chars)"
+    # Batched analysis (ANALYSIS_BATCH_SIZE > 1)
+
+    def _analyze_batch_step(self, state: ResearchState) -> Dict[str, Any]:
+        companies = []
+        for batch in self._pending_batches(state):
+            if self._deadline_passed(f"analysis of {len(batch)} tools"):
+                companies.extend(item.company for item in batch)
+                continue
+            pages = {item.company.name: item.content for item in batch}
+            analyses = self._analyze_companies_batch(pages)
+
+            for item in batch:
+                analysis = analyses.get(item.company.name)
+                if analysis is None:
+                    self._log_batch_miss(item.company.name)
+                    analysis = self._analyze_company_content(
+                        item.company.name, item.content
                     )
+                companies.append(
+                    self._analyzed_copy(item.company, analysis, item.content)
+                )
+
+        return {"companies": companies, "pending_analyses": None}
 
-                if not content:
-                    self.logger.error(
-                        f"❌ No content available for {tool_name}, skipping"
+    async def _aanalyze_batch_step(self, state: ResearchState) -> Dict[str, Any]:
+        companies = []
+        for batch in self._pending_batches(state):
+            if self._deadline_passed(f"analysis of {len(batch)} tools"):
+                companies.extend(item.company for item in batch)
+                continue
+            pages = {item.company.name: item.content for item in batch}
+            analyses = await self._aanalyze_companies_batch(pages)
+
+            for item in batch:
+                analysis = analyses.get(item.company.name)
+                if analysis is None:
+                    self._log_batch_miss(item.company.name)
+                    analysis = await self._aanalyze_company_content(
+                        item.company.name, item.content
                     )
-                    continue
+                companies.append(
+                    self._analyzed_copy(item.company, analysis, item.content)
+                )
+
+        return {"companies": companies, "pending_analyses": None}
 
-                self.logger.info(f"🧠 Analyzing {tool_name}")
-                analysis = self._analyze_company_content(company.name, content)
+    def _pending_batches(self, state: ResearchState) -> List[List[PendingAnalysis]]:
+        pending = state.pending_analyses
+        batch_size = self.settings.ANALYSIS_BATCH_SIZE
+
+        batches = [
+            pending[start : start + batch_size]
+            for start in range(0, len(pending), batch_size)
+        ]
+        for batch in batches:
+            names = ", ".join(item.company.name for item in batch)
+            self.logger.info("🧠 Analyzing batch: %s", names)
+        return batches
 
-                company.pricing_model = analysis.pricing_model
-                company.is_open_source = analysis.is_open_source
-                company.tech_stack = analysis.tech_stack
-                company.description = analysis.description
-                company.api_available = analysis.api_available
-                company.language_support = analysis.language_support
-                company.integration_capabilities = analysis.integration_capabilities
+    def _log_batch_miss(self, company_name: str):
+        record_fallback("analyze_batch.per_tool")
+        self.logger.warning(
+            "⚠️ No batched analysis for %s, analyzing alone", company_name
+        )
 
-                companies.append(company)
-                self.logger.info(f"✅ Successfully researched {tool_name}")
+    def _analyzed_copy(
+        self, company: CompanyInfo, analysis: CompanyAnalysis, content: str
+    ) -> CompanyInfo:
+        company = company.model_copy()
+        self._apply_analysis(company, analysis)
+        self._remember(company, analysis, content)
+        return company
 
-        self.logger.info(f"📋 Total companies researched: {len(companies)}")
-        return {"companies": companies}
+    def _analyze_companies_batch(
+        self, pages: Dict[str, str]
+    ) -> Dict[str, CompanyAnalysis]:
+        """Analyze several tools in one structured call, keyed by tool name.
+
+        Tools missing from the response, or every tool if the call fails,
+        are absent from the result so callers can fall back per tool.
+        """
+        try:
+            batch = self.llm.invoke_structured(
+                self._batch_analysis_messages(pages),
+                BatchCompanyAnalysis,
+                stage="research",
+            )
+            return self._match_batch_analyses(pages, batch)
+        except Exception as e:
+            self.logger.exception(
+                "Error analyzing batch of %d tools: %s", len(pages), e
+            )
+            return {}
+
+    async def _aanalyze_companies_batch(
+        self, pages: Dict[str, str]
+    ) -> Dict[str, CompanyAnalysis]:
+        try:
+            batch = await self.llm.ainvoke_structured(
+                self._batch_analysis_messages(pages),
+                BatchCompanyAnalysis,
+                stage="research",
+            )
+            return self._match_batch_analyses(pages, batch)
+        except Exception as e:
+            self.logger.exception(
+                "Error analyzing batch of %d tools: %s", len(pages), e
+            )
+            return {}
+
+    def _batch_analysis_messages(self, pages: Dict[str, str]) -> List[BaseMessage]:
+        return _chat_messages(
+            self.prompts.TOOL_ANALYSIS_SYSTEM,
+            self.prompts.tool_batch_analysis_user(
+                {
+                    name: self._condense_for_analysis(name, content)
+                    for name, content in pages.items()
+                }
+            ),
+        )
+
+    def _match_batch_analyses(
+        self, pages: Dict[str, str], batch: BatchCompanyAnalysis
+    ) -> Dict[str, CompanyAnalysis]:
+        requested = {name.lower(): name for name in pages}
+        analyses = {}
+        for item in batch.analyses:
+            name = requested.get(item.tool_name.strip().lower())
+            if name and name not in analyses:
+                analyses[name] = CompanyAnalysis(
+                    **item.model_dump(exclude={"tool_name"})
+                )
+        return analyses
+
+    # Stage 3: recommendations
 
     def _analyze_step(self, state: ResearchState) -> Dict[str, Any]:
+        messages = self._recommendation_messages(state)
+        if messages is None:
+            return self._no_companies_update()
+        if self._deadline_passed("recommendations"):
+            return self._deadline_update()
+
+        try:
+            response = self.recommendation_llm.invoke(messages, stage="analyze")
+        except TokenBudgetExceeded as e:
+            return self._budget_exceeded_update(e)
+        except DeadlineExceeded as e:
+            return self._deadline_update(e)
+        except Exception as e:
+            self._log_analyze_failure(e)
+            raise
+        return {"analysis": response.content}
+
+    async def _aanalyze_step(self, state: ResearchState) -> Dict[str, Any]:
+        messages = self._recommendation_messages(state)
+        if messages is None:
+            return self._no_companies_update()
+        if self._deadline_passed("recommendations"):
+            return self._deadline_update()
+
+        try:
+            response = await self.recommendation_llm.ainvoke(
+                messages, stage="analyze"
+            )
+        except TokenBudgetExceeded as e:
+            return self._budget_exceeded_update(e)
+        except DeadlineExceeded as e:
+            return self._deadline_update(e)
+        except Exception as e:
+            self._log_analyze_failure(e)
+            raise
+        return {"analysis": response.content}
+
+    def _recommendation_messages(
+        self, state: ResearchState
+    ) -> Optional[List[BaseMessage]]:
+        self.logger.info("📋 Total companies researched: %d", len(state.companies))
         self.logger.info("💡 Generating recommendations")
 
         if not state.companies:
             self.logger.warning("⚠️ No companies to analyze")
-            return {
-                "analysis": "No tools were found to analyze. Please try a different query."
-            }
+            return None
 
-        company_data = "\n\n".join(
-            [
-                f"Tool: {company.name}\n" + company.model_dump_json(indent=2)
-                for company in state.companies
-            ]
+        company_data = compact_companies(
+            state.companies, self.settings.RECOMMENDATION_COMPANY_BUDGET
         )
 
-        messages = [
-            SystemMessage(content=self.prompts.RECOMMENDATIONS_SYSTEM),
-            HumanMessage(
-                content=self.prompts.recommendations_user(state.query, company_data)
-            ),
-        ]
+        return _chat_messages(
+            self.prompts.RECOMMENDATIONS_SYSTEM,
+            self.prompts.recommendations_user(state.query, company_data),
+        )
 
-        response = self.llm.invoke(messages)
-        return {"analysis": response.content}
+    def _no_companies_update(self) -> Dict[str, Any]:
+        return {
+            "analysis": "No tools were found to analyze. Please try a different query."
+        }
+
+    def _deadline_update(self, error: Optional[DeadlineExceeded] = None) -> Dict[str, Any]:
+        if error:
+            record_fallback("workflow.deadline")
+            self.logger.warning("⏰ %s, skipping recommendations", error)
+        return {
+            "analysis": "Query deadline reached before recommendations could be generated."
+        }
+
+    def _budget_exceeded_update(self, error: TokenBudgetExceeded) -> Dict[str, Any]:
+        self.logger.error("❌ Skipping recommendations: %s", error)
+        return {
+            "analysis": "Token budget exhausted before recommendations could be generated."
+        }
+
+    def _log_analyze_failure(self, error: Exception):
+        # Re-raised so the run stops before "analyze" and can be resumed there
+        run = current_run()
+        run_id = run.run_id if run else None
+        self.logger.exception(
+            "❌ Error generating recommendations for run %s: %s", run_id, error
+        )
+
+    def _run_config(self, graph: CompiledStateGraph, run: RunContext) -> Dict[str, Any]:
+        config = {"max_concurrency": self.settings.RESEARCH_MAX_CONCURRENCY}
+        if graph.checkpointer is not None:
+            config["configurable"] = {"thread_id": run.run_id}
+        return config
+
+    def _run_input(
+        self, query: str, config: Dict[str, Any], saved: Any
+    ) -> Optional[ResearchState]:
+        """Initial state for a new run, or None to resume the `saved` snapshot."""
+        if saved is None or not saved.next:
+            return ResearchState(query=query)
+
+        thread_id = config["configurable"]["thread_id"]
+        if saved.values.get("query") != query:
+            raise ValueError(
+                f"Run {thread_id} was for query '{saved.values.get('query')}', not '{query}'"
+            )
+        self.logger.info("⏯️ Resuming run %s at %s", thread_id, ", ".join(saved.next))
+        return None
+
+    def _new_context(self, thread_id: Optional[str]) -> RunContext:
+        return RunContext(run_id=thread_id) if thread_id else RunContext()
+
+    def _run_failed(self, graph: CompiledStateGraph, run: RunContext):
+        if graph.checkpointer is not None:
+            self.logger.error(
+                "❌ Run %s failed; pass thread_id='%s' to resume it",
+                run.run_id,
+                run.run_id,
+            )
+
+    def _result(self, final_state: Dict[str, Any], run: RunContext) -> ResearchState:
+        result = ResearchState(**final_state)
+        result.token_usage = run.tokens.report()
+        result.timings = run.timings.report()
+        return result
+
+    def run(self, query: str, thread_id: Optional[str] = None) -> ResearchState:
+        """Research `query`, checkpointing each step under `thread_id`.
+
+        A run that failed is resumed from its last completed step by calling
+        `run` again with the same query and the `thread_id` it logged.
+        """
+        graph = self.checkpointed_workflow
+        with run_context(self._new_context(thread_id)) as run, timed("workflow.run"):
+            config = self._run_config(graph, run)
+            saved = graph.get_state(config) if graph.checkpointer else None
+            try:
+                final_state = graph.invoke(
+                    self._run_input(query, config, saved), config=config
+                )
+            except Exception:
+                self._run_failed(graph, run)
+                raise
+            if graph.checkpointer is not None:
+                graph.checkpointer.delete_thread(run.run_id)
+        return self._result(final_state, run)
+
+    async def arun(self, query: str, thread_id: Optional[str] = None) -> ResearchState:
+        """Async counterpart of `run`, sharing the caller's event loop."""
+        with run_context(self._new_context(thread_id)) as run, timed("workflow.run"):
+            async with self._acheckpointed_workflow() as graph:
+                config = self._run_config(graph, run)
+                saved = await graph.aget_state(config) if graph.checkpointer else None
+                try:
+                    final_state = await graph.ainvoke(
+                        self._run_input(query, config, saved), config=config
+                    )
+                except Exception:
+                    self._run_failed(graph, run)
+                    raise
+                if graph.checkpointer is not None:
+                    await graph.checkpointer.adelete_thread(run.run_id)
+        return self._result(final_state, run)
+
+    async def aprewarm(
+        self, tool_names: List[str], refresh: bool = False
+    ) -> Dict[str, str]:
+        """Research tools into the knowledge base ahead of any query.
+
+        Names are canonicalized first, as queries look tools up by their
+        canonical name. Tools with a fresh record are skipped unless
+        `refresh` is set. Returns each canonical tool's outcome: "fresh",
+        "researched" or "failed".
+        """
+        if not self.knowledge:
+            raise ValueError("Knowledge base is disabled (KNOWLEDGE_BASE_ENABLED)")
+
+        tool_names, duplicates = ToolCanonicalizer().dedupe(tool_names)
+        for duplicate, survivor in duplicates.items():
+            self.logger.info("🔁 '%s' is %s, warming it once", duplicate, survivor)
 
-    def run(self, query: str) -> ResearchState:
-        initial_state = ResearchState(query=query)
-        final_state = self.workflow.invoke(initial_state)
-        return ResearchState(**final_state)
+        semaphore = asyncio.Semaphore(max(1, self.settings.RESEARCH_MAX_CONCURRENCY))
+        # Two names that resolve to one site are still only researched once
+        sites = SiteClaims()
+
+        async def warm(tool_name: str) -> str:
+            if not refresh and self.knowledge.is_fresh(tool_name):
+                return "fresh"
+            # Each tool gets the deadline and token budget of a query
+            async with semaphore:
+                with run_context(RunContext(sites=sites)):
+                    company = await self._aresearch_tool(tool_name)
+            if company and self.knowledge.is_fresh(tool_name):
+                return "researched"
+            return "failed"
+
+        outcomes = await asyncio.gather(*(warm(name) for name in tool_names))
+        return dict(zip(tool_names, outcomes))
+
+    def stream(self, query: str) -> Iterator[WorkflowEvent]:
+        """Run the workflow, yielding results as soon as each stage produces them.
+
+        Emits a "tools" event with the tools being researched, a "company"
+        event per researched tool as its analysis completes, "token" events
+        for the recommendation text and a final "done" event with the full
+        `ResearchState`.
+        """
+        final_state: Dict[str, Any] = {}
+        streamed_tokens = False
+        with run_context() as run, timed("workflow.run"):
+            for mode, chunk in self.workflow.stream(
+                ResearchState(query=query),
+                config=self._run_config(self.workflow, run),
+                stream_mode=["updates", "messages", "values"],
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+
+                for event in self._stream_events(mode, chunk, streamed_tokens):
+                    streamed_tokens = streamed_tokens or event.type == "token"
+                    yield event
+
+        yield WorkflowEvent(type="done", result=self._result(final_state, run))
+
+    async def astream(self, query: str) -> AsyncIterator[WorkflowEvent]:
+        """Async counterpart of `stream`."""
+        final_state: Dict[str, Any] = {}
+        streamed_tokens = False
+        with run_context() as run, timed("workflow.run"):
+            async for mode, chunk in self.workflow.astream(
+                ResearchState(query=query),
+                config=self._run_config(self.workflow, run),
+                stream_mode=["updates", "messages", "values"],
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+
+                for event in self._stream_events(mode, chunk, streamed_tokens):
+                    streamed_tokens = streamed_tokens or event.type == "token"
+                    yield event
+
+        yield WorkflowEvent(type="done", result=self._result(final_state, run))
+
+    def _stream_events(
+        self, mode: str, chunk: Any, streamed_tokens: bool
+    ) -> List[WorkflowEvent]:
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") == "analyze" and message.content:
+                return [WorkflowEvent(type="token", token=message.content)]
+            return []
+
+        events = []
+        for node, update in chunk.items():
+            if not update:
+                continue
+            if node == "plan_research":
+                events.append(
+                    WorkflowEvent(type="tools", tools=update["research_targets"])
+                )
+            elif node in ("research", "analyze_batch"):
+                events.extend(
+                    WorkflowEvent(type="company", company=company)
+                    for company in update.get("companies", [])
+                )
+            elif node == "analyze" and not streamed_tokens:
+                # Memoized or failed recommendations arrive without token chunks
+                events.append(WorkflowEvent(type="token", token=update["analysis"]))
+        return events